@@ -1,9 +1,11 @@
 """Acceptance tests for yala executable."""
 import re
-from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
+from multiprocessing.pool import ThreadPool
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
 from yala.main import main
 
@@ -14,20 +16,25 @@ class TestAcceptance(TestCase):
     @classmethod
     @patch("yala.main.sys.exit")
     @patch("yala.main.sys.stdout", new_callable=StringIO)
-    @patch("yala.main.Pool")
+    @patch("multiprocessing.Pool")
     def setUpClass(cls, pool_mock, stdout_mock, exit_mock):
         """Get yala's output to be used in tests.
 
         As coverage outputs random results with --concurrency=multiprocessing,
-        we use Python threads instead.
+        we use Python threads instead. The pool is imported when linting, so
+        it's patched in :mod:`multiprocessing`.
         """
         # Ignore params of patch decorators:
         # pylint: disable=arguments-differ
         cls._exit = exit_mock
         # Replace multiprocessing by Python threads
-        pool_mock.return_value = ThreadPoolExecutor()
-        with patch("yala.main.sys.argv", ["yala", "tests_data/"]):
-            main()
+        pool_mock.return_value = ThreadPool()
+        with TemporaryDirectory() as cache_dir, patch(
+            "yala.config.Config.cache_dir", new_callable=PropertyMock
+        ) as cache_dir_mock:
+            cache_dir_mock.return_value = cache_dir
+            with patch("yala.main.sys.argv", ["yala", "tests_data/"]):
+                main()
         cls._output = stdout_mock.getvalue()
 
     def _assert_results(self, lines, linter_name):
@@ -124,16 +131,16 @@ class TestAcceptance(TestCase):
             "1:0|Unused import os (W0611, unused-import)",
             "2:0|Unused import abc (W0611, unused-import)",
             "7:0|Too many branches (20/12) (R0912, too-many-branches)",
-            "1:0|Similar lines in 2 files\n"
-            "==duplicate1:[5:10]\n"
-            "==duplicate2:[5:10]\n"
-            "    aaa = 0\n"
-            "    bbb = 1\n"
-            "    ccc = 2\n"
-            "    ddd = 3\n"
-            "    print(aaa + bbb + ccc + ddd) (R0801, duplicate-code)",
         )
         self._assert_results(expected, "pylint")
+        self.assertNotIn("R0801", self._output)
+
+    def test_duplicates(self):
+        """Check the duplicates linter output."""
+        path = Path("tests_data", "duplicate2.py")
+        expected = f"6:None|Lines 6-10 are duplicated in {path}:6-10 "
+        expected += "[duplicate-code]"
+        self._assert_result(expected, "duplicates")
 
     def test_rest_radon_cc(self):
         """Check radon cc ouput."""
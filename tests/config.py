@@ -31,7 +31,8 @@ class TestConfig(TestCase):
             "linters: linter a, linter b",
             "isort args: --check",
             'pylint args: --msg-template="{path}:{msg}'
-            ' ({msg_id}, {symbol}):{line}:{column}"',
+            ' ({msg_id}, {symbol}):{line}:{column}"'
+            " --disable=duplicate-code",
             "radon cc args: --min D",
             "radon mi args: --min D",
             "black args: --line-length 79",
@@ -52,7 +53,8 @@ class TestConfig(TestCase):
             "linters: linter b",
             "isort args: --check",
             'pylint args: --msg-template="{path}:{msg}'
-            ' ({msg_id}, {symbol}):{line}:{column}"',
+            ' ({msg_id}, {symbol}):{line}:{column}"'
+            " --disable=duplicate-code",
             "radon cc args: --min D",
             "radon mi args: --min D",
             "black args: --line-length 79",
@@ -68,6 +70,49 @@ class TestConfig(TestCase):
         config = self._get_config(all_linters, user_config)
         self.assertNotIn("invalid-linter", config.linters)
 
+    def test_tiers(self):
+        """Untiered linters should run in the last tier."""
+        all_linters = {"a": "A", "b": "B", "c": "C", "d": "D"}
+        user_config = {"tiers": "b, c\na"}
+        config = self._get_config(all_linters, user_config)
+        self.assertEqual([["b", "c"], ["a"], ["d"]], config.tiers)
+
+    def test_no_tiers(self):
+        """All linters should be in a single tier by default."""
+        all_linters = {"a": "A", "b": "B"}
+        config = self._get_config(all_linters)
+        self.assertEqual([["A", "B"]], config.get_linter_tiers())
+
+    def test_ignored_rules(self):
+        """Rules can be separated by commas, spaces or lines."""
+        config = self._get_config(user_cfg={"ignore": "E501, D203\nW0511"})
+        self.assertEqual(["E501", "D203", "W0511"], config.ignored_rules)
+
+    def test_max_memory(self):
+        """Memory budgets should be converted to KiB."""
+        values = ("512M", "1.5 GiB", "8gb", "lots")
+        budgets = [self._get_config(user_cfg={"max memory": value}).max_memory
+                   for value in values]  # fmt: skip
+        self.assertEqual([512 * 1024, 1536 * 1024, 8 * 1024**2, None],
+                         budgets)  # fmt: skip
+
+    def test_per_file_ignores(self):
+        """Entries should be split by semicolons and lines."""
+        value = "tests/*: D100, D103; migrations/*: *\ndocs/*:E501\ninvalid"
+        config = self._get_config(user_cfg={"per file ignores": value})
+        self.assertEqual([("tests/*", ["D100", "D103"]),
+                          ("migrations/*", ["*"]), ("docs/*", ["E501"])],
+                         config.per_file_ignores)  # fmt: skip
+
+    def test_target_filter_options(self):
+        """File size should be in bytes and vendored globs split."""
+        user_cfg = {"max file size": "1M", "skip generated": "yes",
+                    "vendored": "vendor/*,\n*/_vendor/*"}  # fmt: skip
+        config = self._get_config(user_cfg=user_cfg)
+        self.assertEqual(1024**2, config.max_file_size)
+        self.assertTrue(config.skip_generated)
+        self.assertEqual(["vendor/*", "*/_vendor/*"], config.vendored)
+
     @classmethod
     def _get_config(cls, all_linters=None, user_cfg=None, default_cfg=None):
         """Return real config with mocked ConfigParser."""
@@ -0,0 +1,65 @@
+"""Tests for the duplicates module."""
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from yala.duplicates import (FileIndex, find_duplicates, get_normalized_lines,
+                             main)
+
+
+class TestNormalizedLines(unittest.TestCase):
+    """Test which lines are compared."""
+
+    def test_skipped_lines(self):
+        """Comments, docstrings, imports and signatures should be dropped."""
+        source = (b'"""Docstring."""\n'
+                  b"import os\n"
+                  b"from abc import ABC\n"
+                  b"\n"
+                  b"def function(arg):  # comment\n"
+                  b"    '''Docstring.'''\n"
+                  b"    return  os.path.join(arg,\n"
+                  b"                         'x')\n")  # fmt: skip
+        expected = [(7, "return os . path . join ( arg ,"), (8, "'x' )")]
+        self.assertEqual(expected, get_normalized_lines(source))
+
+
+class TestFindDuplicates(unittest.TestCase):
+    """Test finding duplicates with winnowing."""
+
+    def test_tests_data(self):
+        """The duplicated function body should be found in both files."""
+        paths = ["tests_data/duplicate1.py", "tests_data/duplicate2.py"]
+        indexes = [FileIndex(path, 4) for path in paths]
+        self.assertEqual([(paths[0], 0, paths[1], 0, 5)],
+                         find_duplicates(indexes, 4))  # fmt: skip
+
+    def test_minimum_lines(self):
+        """Any duplicate of the minimum lines should be found."""
+        body = [f"x{i} = {i}" for i in range(6)]
+        with TemporaryDirectory() as folder:
+            for prefix in range(4):
+                path1, path2 = Path(folder, "a.py"), Path(folder, "b.py")
+                path1.write_text("\n".join(body), "utf-8")
+                other = [f"y{i} = {i}" for i in range(prefix)]
+                path2.write_text("\n".join(other + body[1:5]), "utf-8")
+                indexes = [FileIndex(str(path), 4) for path in (path1, path2)]
+                duplicates = find_duplicates(indexes, 4)
+                self.assertEqual([(str(path1), 1, str(path2), prefix, 4)],
+                                 duplicates)  # fmt: skip
+                self.assertEqual([], find_duplicates(indexes, 5))
+
+    def test_parallel_output(self):
+        """Both locations should be printed, also indexing in parallel."""
+        path1, path2 = (Path("tests_data", f"duplicate{i}.py") for i in (1, 2))
+        for jobs in ("1", "2"):
+            stdout = StringIO()
+            with redirect_stdout(stdout):
+                main(["--jobs", jobs, "tests_data"])
+            self.assertEqual(
+                f"{path1}:6: Lines 6-10 are duplicated in {path2}:6-10 "
+                "[duplicate-code]\n",
+                stdout.getvalue(),
+            )
@@ -0,0 +1,42 @@
+"""Tests for the engine module."""
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from yala.engine import Engine, RadonCC
+
+
+class TestEngine(unittest.TestCase):
+    """Test checking files in-process."""
+
+    def setUp(self):
+        """Create a file with issues in a temporary folder."""
+        tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = str(Path(tmp_dir.name, "code.py"))
+
+    def test_output(self):
+        """Checkers should print the lines the linters' commands print."""
+        Path(self.path).write_text("import os\nx=1\n", encoding="utf-8")
+        outputs = Engine({"pyflakes": [], "pycodestyle": []}, [self.path])
+        expected = {
+            "pyflakes": [f"{self.path}:1:1: 'os' imported but unused"],
+            "pycodestyle": [
+                f"{self.path}:2:2: E225 missing whitespace around operator"
+            ],
+        }
+        for name, (stdout, stderr) in outputs.check().items():
+            self.assertEqual(expected[name], stdout)
+            self.assertEqual([], stderr)
+
+    def test_syntax_error(self):
+        """A file with syntax errors should be parsed once and reported."""
+        Path(self.path).write_text("def f(:\n", encoding="utf-8")
+        outputs = Engine({"pyflakes": [], "radon cc": []}, [self.path]).check()
+        self.assertIn("invalid syntax", outputs["pyflakes"][1][0])
+        self.assertEqual("    ERROR: invalid syntax (<unknown>, line 1)",
+                         outputs["radon cc"][0][1])  # fmt: skip
+
+    def test_unknown_args(self):
+        """Arguments that can't be mapped should raise ValueError."""
+        self.assertRaises(ValueError, RadonCC, ["--json"], [self.path])
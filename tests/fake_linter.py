@@ -0,0 +1,150 @@
+"""Stand-in linters with configurable output, delay, CPU and memory usage.
+
+Run as a script, it prints fake results in a real linter's format::
+
+    python -m tests.fake_linter pylint --count 1000 --delay 0.5 file.py
+    python -m tests.fake_linter mypy --memory 200 --pid-file mypy.pid
+
+The linter classes below run this script and parse its output with the real
+parsers, so yala's scheduling can be tested on any machine. Set their
+options with "<name> args" in :class:`FakeConfig`, e.g.
+``{"fake pylint args": "--count 10 --delay 2"}``.
+"""
+import argparse
+import os
+import shlex
+import sys
+import time
+from configparser import ConfigParser
+
+from yala.config import Config
+from yala.linters import Black, Flake8, Isort, Mypy, Pycodestyle, Pylint
+
+#: dict: Result line format of each linter, by format name.
+FORMATS = {
+    "pylint": "{path}:Fake message {i} (C9999, fake-message):{line}:0",
+    "pycodestyle": "{path}:{line}:1: E999 fake message {i}",
+    "flake8": "{path}:{line}:1: E999 fake message {i}",
+    "mypy": "{path}:{line}: error: Fake message {i}  [fake]",
+    "isort": "ERROR: {abs_path} Imports are incorrectly sorted and/or "
+    "formatted.",
+    "black": "would reformat {path}",
+}
+
+#: set: Formats whose results are printed to stderr.
+_STDERR_FORMATS = {"isort", "black"}
+
+
+def _command(fmt):
+    """Return the command that runs this script with a format."""
+    return f"{shlex.quote(sys.executable)} -m tests.fake_linter {fmt}"
+
+
+class FakePylint(Pylint):
+    """Fake pylint."""
+
+    name = "fake pylint"
+    command = _command("pylint")
+
+
+class FakePycodestyle(Pycodestyle):
+    """Fake pycodestyle."""
+
+    name = "fake pycodestyle"
+    command = _command("pycodestyle")
+
+
+class FakeFlake8(Flake8):
+    """Fake flake8."""
+
+    name = "fake flake8"
+    command = _command("flake8")
+
+
+class FakeMypy(Mypy):
+    """Fake mypy."""
+
+    name = "fake mypy"
+    command = _command("mypy")
+
+
+class FakeIsort(Isort):
+    """Fake isort."""
+
+    name = "fake isort"
+    command = _command("isort")
+
+
+class FakeBlack(Black):
+    """Fake black."""
+
+    name = "fake black"
+    command = _command("black")
+
+
+#: dict: All fake linters by name.
+FAKE_LINTERS = {cls.name: cls for cls in (FakePylint, FakePycodestyle,
+                                          FakeFlake8, FakeMypy, FakeIsort,
+                                          FakeBlack)}  # fmt: skip
+
+
+class FakeConfig(Config):
+    """Config with the given [yala] options instead of the user's files."""
+
+    def __init__(self, all_linters, options=None):
+        """Use ``options`` as the user's [yala] section."""
+        self._options = options or {}
+        super().__init__(all_linters)
+
+    # Reading instance options instead of files:
+    # pylint: disable=arguments-differ
+    def _read_user_files(self):
+        user_cfg = ConfigParser()
+        user_cfg.read_dict({self._CFG_SECTION: self._options})
+        return user_cfg
+
+
+def _burn(seconds):
+    """Keep the CPU busy."""
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def _use_memory(megabytes):
+    """Return a buffer of ``megabytes`` MiB with all pages in memory."""
+    buffer = bytearray(megabytes * 1024 * 1024)
+    for page in range(0, len(buffer), 4096):
+        buffer[page] = 1
+    return buffer
+
+
+def main(argv=None):
+    """Print fake results after a delay, CPU burn and memory use."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("format", choices=FORMATS)
+    parser.add_argument("--count", type=int, default=1, help="results")
+    parser.add_argument("--delay", type=float, default=0, help="sleep (s)")
+    parser.add_argument("--burn", type=float, default=0, help="CPU time (s)")
+    parser.add_argument("--memory", type=int, default=0, help="RSS (MiB)")
+    parser.add_argument("--pid-file", help="write the process id first")
+    parser.add_argument("paths", nargs="*", default=["fake.py"])
+    args = parser.parse_intermixed_args(argv)
+    if args.pid_file:
+        with open(args.pid_file, "w", encoding="utf-8") as pid_file:
+            pid_file.write(str(os.getpid()))
+    buffer = _use_memory(args.memory)
+    time.sleep(args.delay)
+    _burn(args.burn)
+    del buffer
+    line_format = FORMATS[args.format]
+    out = sys.stderr if args.format in _STDERR_FORMATS else sys.stdout
+    for i in range(args.count):
+        path = args.paths[i % len(args.paths)]
+        abs_path = os.path.abspath(path)
+        out.write(line_format.format(path=path, abs_path=abs_path, i=i,
+                                     line=i + 1) + "\n")  # fmt: skip
+
+
+if __name__ == "__main__":
+    main()
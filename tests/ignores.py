@@ -0,0 +1,49 @@
+"""Tests for the ignores module."""
+import os
+import unittest
+from unittest.mock import patch
+
+from yala.base import LinterOutput
+from yala.ignores import PerFileIgnores
+
+
+class TestPerFileIgnores(unittest.TestCase):
+    """Test rules ignored per file."""
+
+    def setUp(self):
+        """Ignore docstrings in tests and everything in migrations."""
+        self.ignores = PerFileIgnores([("tests/*", ["D100", "D103"]),
+                                       ("*/test_*.py", ["E501"]),
+                                       ("*/conftest.py", ["unused-import"]),
+                                       ("migrations/*", ["*"])])  # fmt: skip
+
+    def test_rules(self):
+        """Rules of all matching globs should be ignored."""
+        rules = self.ignores.get_rules("./tests/test_x.py")
+        self.assertEqual({"D100", "D103", "E501"}, rules)
+        self.assertEqual(set(), self.ignores.get_rules("yala/main.py"))
+
+    def test_is_ignored(self):
+        """Results should be ignored by rule, or all of them with "*"."""
+        results = [
+            LinterOutput("pydocstyle", "tests/a.py", "D100: Missing"),
+            LinterOutput("pydocstyle", "tests/a.py", "D101: Missing"),
+            LinterOutput("pylint", "migrations/0001.py", "Some message"),
+            LinterOutput("pydocstyle", "yala/a.py", "D100: Missing"),
+            LinterOutput("pylint", "yala/conftest.py",
+                         "Unused import os (W0611, unused-import)"),
+            LinterOutput("pylint", "yala/conftest.py",
+                         "Unused variable 'x' (W0612, unused-variable)"),
+        ]  # fmt: skip
+        ignored = [self.ignores.is_ignored(result) for result in results]
+        self.assertEqual([True, False, True, False, True, False], ignored)
+
+    def test_path_cache(self):
+        """Each distinct path should be matched only once."""
+        path = os.path.abspath("tests/a.py")
+        normalize = "yala.ignores._normalize"
+        with patch(normalize, return_value="tests/a.py") as mock_normalize:
+            for _ in range(3):
+                self.ignores.get_rules(path)
+        mock_normalize.assert_called_once_with(path)
+        self.assertFalse(PerFileIgnores([]))
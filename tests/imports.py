@@ -0,0 +1,58 @@
+"""Tests for the imports module."""
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from yala.imports import ImportGraph, get_imports
+
+
+class TestImports(unittest.TestCase):
+    """Test import parsing."""
+
+    def test_relative_imports(self):
+        """Relative imports should be resolved from the module's package."""
+        source = b"from . import a\nfrom ..b import c\nimport d.e\n"
+        imports = get_imports(source, "pkg.sub.mod")
+        expected = {"pkg", "pkg.sub", "pkg.sub.a", "pkg.b", "pkg.b.c", "d",
+                    "d.e"}  # fmt: skip
+        self.assertEqual(expected, imports)
+
+    def test_package_relative_import(self):
+        """In ``__init__.py``, "." is the package itself."""
+        imports = get_imports(b"from .a import b\n", "pkg", is_package=True)
+        self.assertEqual({"pkg", "pkg.a", "pkg.a.b"}, imports)
+
+    def test_syntax_error(self):
+        """Files with syntax errors have no imports."""
+        self.assertEqual(set(), get_imports(b"import (", "mod"))
+
+
+class TestImportGraph(unittest.TestCase):
+    """Test reverse dependencies."""
+
+    def test_dependents(self):
+        """Files importing a changed file should be found transitively."""
+        with TemporaryDirectory() as tmp_dir:
+            cwd = os.getcwd()
+            os.chdir(tmp_dir)
+            self.addCleanup(os.chdir, cwd)
+            Path("pkg").mkdir()
+            files = {
+                "pkg/__init__.py": "",
+                "pkg/a.py": "X = 1\n",
+                "pkg/b.py": "from .a import X\n",
+                "pkg/c.py": "import pkg.b\n",
+                "pkg/d.py": "import os\n",
+            }
+            for path, source in files.items():
+                Path(path).write_text(source, "utf-8")
+            digests = {path: path for path in files}  # any unique value
+            graph = ImportGraph(digests)
+            dependents = graph.get_dependents(["pkg/a.py"])
+            # Importers of a removed module are found by its module name
+            Path("pkg/a.py").unlink()
+            del digests["pkg/a.py"]
+            removed = ImportGraph(digests).get_dependents(["pkg/a.py"])
+        self.assertEqual({"pkg/a.py", "pkg/b.py", "pkg/c.py"}, dependents)
+        self.assertEqual(dependents, removed)
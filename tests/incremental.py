@@ -0,0 +1,70 @@
+"""Tests for the incremental module."""
+import os
+import unittest
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest.mock import Mock
+
+from yala.incremental import IncrementalRun
+
+
+class TestIncrementalRun(unittest.TestCase):
+    """Test which files are linted again."""
+
+    def test_ignored_rules_digest(self):
+        """Changing ignored rules should lint files again."""
+        with NamedTemporaryFile(suffix=".py") as file:
+            digests = []
+            for ignored in ([], ["E501"]):
+                config = Mock(ignored_rules=ignored, cache_dir=None)
+                config.get_linter_config.return_value = {}
+                run = IncrementalRun(Mock(), config, [file.name])
+                digests.append(run.get_digest("pycodestyle", file.name))
+        self.assertNotEqual(digests[0], digests[1])
+
+    def test_cross_file(self):
+        """A changed file should lint all files with cross-file linters."""
+        linter = Mock(cross_file=True, cross_module=False)
+        linter.name = "duplicates"
+        config = Mock(ignored_rules=[], cache_dir=None)
+        config.get_linter_config.return_value = {}
+        store = Mock()
+        with NamedTemporaryFile(suffix=".py") as changed:
+            with NamedTemporaryFile(suffix=".py") as unchanged:
+                files = [changed.name, unchanged.name]
+                run = IncrementalRun(store, config, files)
+                digests = {path: run.get_digest("duplicates", path)
+                           for path in files}  # fmt: skip
+                store.get_digests.return_value = {
+                    unchanged.name: digests[unchanged.name]
+                }
+                self.assertEqual({"duplicates": sorted(files)},
+                                 run.get_targets([linter]))  # fmt: skip
+                store.get_digests.return_value = digests
+                self.assertEqual({"duplicates": []},
+                                 run.get_targets([linter]))  # fmt: skip
+
+    def test_packages(self):
+        """Unchanged packages should be skipped, changed ones linted whole."""
+        linter = Mock(cross_file=False, cross_module=True)
+        linter.name = "mypy"
+        config = Mock(ignored_rules=[], cache_dir=None)
+        config.get_linter_config.return_value = {}
+        store = Mock()
+        with TemporaryDirectory() as tmp:
+            files = []
+            for path in ("a/__init__.py", "a/mod.py", "b/__init__.py"):
+                files.append(os.path.join(tmp, path))
+                Path(files[-1]).parent.mkdir(exist_ok=True)
+                Path(files[-1]).write_text("", "utf-8")
+            run = IncrementalRun(store, config, files)
+            package_a, package_b = (os.path.join(tmp, "a"),
+                                    os.path.join(tmp, "b"))  # fmt: skip
+            linted = run.get_linted({"mypy": [package_a, package_b]})
+            linted = {path: digest for _, path, digest in linted}
+            self.assertEqual(set(files) | {package_a, package_b}, set(linted))
+            store.get_digests.return_value = linted
+            self.assertEqual({"mypy": []}, run.get_targets([linter]))
+            Path(files[1]).write_text("x = 1\n", "utf-8")
+            run = IncrementalRun(store, config, files)
+            self.assertEqual({"mypy": [package_a]}, run.get_targets([linter]))
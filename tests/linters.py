@@ -0,0 +1,122 @@
+"""Tests for the linters module."""
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from yala.linters import Flake8, Isort, Mypy, Pycodestyle, Pydocstyle, Pylint
+
+
+class TestMypy(unittest.TestCase):
+    """Test mypy command."""
+
+    def setUp(self):
+        """Use a temporary cache folder."""
+        tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.mypy = Mypy()
+        self.mypy.cache_dir = tmp_dir.name
+        self.mypy.manage_cache = True
+
+    def test_cache_per_config(self):
+        """Different arguments should not share a cache folder."""
+        self.mypy.config = {"args": "--strict"}
+        strict = self.mypy.command
+        self.mypy.config = {}
+        self.assertIn("--cache-dir", strict)
+        self.assertNotEqual(strict, self.mypy.command)
+        self.mypy.ignored_rules = ["var-annotated"]
+        self.assertNotEqual(strict, self.mypy.command)
+
+    def test_unmanaged_cache(self):
+        """Mypy's own cache should be used unless caches are managed."""
+        self.mypy.config = {}
+        self.mypy.manage_cache = False
+        self.assertEqual("mypy", self.mypy.command)
+        self.mypy.config = {"args": "--cache-dir=/tmp/mine"}
+        self.mypy.manage_cache = True
+        self.assertNotIn(self.mypy.cache_dir, self.mypy.command)
+
+    def test_daemon(self):
+        """Should run dmypy if the daemon is enabled."""
+        self.mypy.config = {"daemon": "true"}
+        self.assertTrue(self.mypy.command.startswith("dmypy --status-file"))
+
+
+class TestIgnoredRules(unittest.TestCase):
+    """Ignored rules should be disabled by the linters that own them."""
+
+    IGNORED = ["E501", "D203", "C0114", "unused-import", "var-annotated"]
+
+    def test_ignore_options(self):
+        """Each linter should receive only its own rules."""
+        expected = {
+            Flake8: "--extend-ignore=E501,D203,C0114",
+            Pydocstyle: "--add-ignore=D203",
+            Pylint: "--disable=C0114,unused-import",
+            Mypy: "--disable-error-code=var-annotated",
+        }
+        for linter_class, options in expected.items():
+            with self.subTest(linter=linter_class.name):
+                linter = self._get_linter(linter_class)
+                self.assertEqual(options, linter.get_ignore_options())
+
+    def test_pycodestyle_config(self):
+        """Pycodestyle's "--ignore" would replace the project's ignore list."""
+        self.assertEqual(
+            "", self._get_linter(Pycodestyle).get_ignore_options()
+        )
+
+    def test_args_after_ignore(self):
+        """Arguments from config should come after ignore options."""
+        linter = self._get_linter(Pydocstyle)
+        linter.config = {"args": "--convention=pep257"}
+        self.assertEqual(
+            "pydocstyle --add-ignore=D203 --convention=pep257",
+            linter.command_with_options,
+        )
+
+    def _get_linter(self, linter_class):
+        linter = linter_class()
+        linter.ignored_rules = self.IGNORED
+        return linter
+
+
+class TestParseBuffers(unittest.TestCase):
+    """Parsing whole outputs should give the same results as lines."""
+
+    def test_pylint(self):
+        """Multi-line pylint results should be matched over the buffer."""
+        output = (
+            "************* Module dup\n"
+            "dup.py:Similar lines in 2 files\n"
+            "==a:[5:10]\n"
+            "    x = 1 (R0801, duplicate-code):1:0\n"
+            "dup.py:Unused import os (W0611, unused-import):2:0\n"
+        )
+        self._assert_same_results(Pylint(), output, 2)
+
+    def test_flake8(self):
+        """Single-line results should be matched over the buffer."""
+        output = "a.py:1:1: F401 'os' imported but unused\r\nnoise\n"
+        self._assert_same_results(Flake8(), output, 1)
+
+    def test_isort_paths(self):
+        """Paths outside the current folder should be kept without errors."""
+        inside = os.path.abspath(os.path.join("pkg", "a.py"))
+        with TemporaryDirectory() as tmp:
+            outside = os.path.join(tmp, "pkg", "a.py")
+            stderr = [f"ERROR: {path} Imports are incorrectly sorted."
+                      for path in (inside, outside)]  # fmt: skip
+            with patch("logging.Logger.error") as log_error:
+                results, _ = Isort().parse([], stderr)
+                paths = [result.path for result in results]
+        self.assertEqual([os.path.join("pkg", "a.py"), outside], paths)
+        log_error.assert_not_called()
+
+    def _assert_same_results(self, linter, output, count):
+        expected, _ = linter.parse(output.splitlines(), [])
+        actual, _ = linter.parse_buffers(output.encode(), b"")
+        expected = [str(result) for result in expected]
+        self.assertEqual(expected, [str(result) for result in actual])
+        self.assertEqual(count, len(expected))
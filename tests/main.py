@@ -1,8 +1,11 @@
 """Tests for the main module."""
+import subprocess  # nosec
+import sys
 import unittest
 from unittest.mock import Mock, patch
 
-from yala.main import LinterRunner
+from yala.base import LinterOutput
+from yala.main import LinterRunner, Main, _LintRun, _run_job, _split
 
 
 class TestLinterRunner(unittest.TestCase):
@@ -14,7 +17,7 @@ class TestLinterRunner(unittest.TestCase):
         # Linter chosen by the user
         name = "my linter"
         mock_config.user_linters = [name]
-        _, stderr = self._path_and_run(mock_config, name)
+        _, _, stderr = self._path_and_run(mock_config, name)
         self.assertIn("Did you install", stderr[0])
 
     @patch("yala.main.Config")
@@ -22,20 +25,156 @@ class TestLinterRunner(unittest.TestCase):
         """Should not print an error when chosen linter is not found."""
         # No linters chosen by the user
         mock_config.user_linters = []
-        stdout, stderr = self._path_and_run(mock_config)
+        _, stdout, stderr = self._path_and_run(mock_config)
         self.assertEqual(0, len(stdout))
         self.assertEqual(0, len(stderr))
 
     def _path_and_run(self, mock_config, name="my linter"):
         cls = self._mock_linter_class(name)
         mock_config.get_linter_classes.return_value = [cls]
-        with patch("yala.main.subprocess.run", side_effect=FileNotFoundError):
-            linter_cfg_tgts = cls, mock_config, []
+        popen = "yala.main.subprocess.Popen"
+        with patch(popen, side_effect=FileNotFoundError):
+            linter_cfg_tgts = cls, mock_config, [], False
             return LinterRunner.run(linter_cfg_tgts)
 
+    @patch("yala.main.Config")
+    def test_per_file_ignores(self, mock_config):
+        """Results ignored per file should be dropped by the worker."""
+        # Mocking the linter's parser:
+        # pylint: disable=protected-access
+        mock_config.per_file_ignores = [("tests/*", ["E501"])]
+        mock_config.ignored_rules = []
+        runner = LinterRunner(self._mock_linter_class("x"), mock_config, [])
+        runner._linter.parse.return_value = (
+            [LinterOutput("x", "tests/a.py", "E501 line too long"),
+             LinterOutput("x", "yala/a.py", "E501 line too long")],
+            [],
+        )  # fmt: skip
+        results, _ = runner.parse([], [])
+        self.assertEqual(["yala/a.py"], [result.path for result in results])
+
     @staticmethod
     def _mock_linter_class(name):
         linter_class = Mock()
         linter = linter_class.return_value
         linter.command_with_options = linter.name = name
+        linter.env = {}
         return linter_class
+
+
+class TestMain(unittest.TestCase):
+    """Test the Main class."""
+
+    # Testing private methods:
+    # pylint: disable=protected-access
+
+    def test_invalid_max_issues(self):
+        """Thresholds that are not positive integers should exit."""
+        for value in ("0", "-1", "ten"):
+            args = {"--fail-fast": False, "--max-issues": value}
+            with self.assertRaises(SystemExit) as context:
+                Main._get_max_issues(args)
+            self.assertIn("positive integer", str(context.exception))
+
+    def test_invalid_ranks(self):
+        """Ranks should be single letters of radon's ranks."""
+        main = Main(config=Mock())
+        for cc_min, mi_min in (("BCD", "A"), ("G", "A"), ("A", "E"),
+                               ("A", "AB")):  # fmt: skip
+            with self.assertRaises(SystemExit) as context:
+                main.print_metrics(["yala"], cc_min, mi_min)
+            self.assertIn("rank must be a letter", str(context.exception))
+
+
+class TestLintRun(unittest.TestCase):
+    """Test the _LintRun class."""
+
+    # Testing private methods:
+    # pylint: disable=protected-access
+
+    def test_max_issues(self):
+        """Should stop collecting results when the threshold is met."""
+        results = iter(
+            [("x", ["a", "b"], ["err"]), ("y", ["c"], []), ("z", ["d"], [])]
+        )
+        names, stdouts, stderrs = _LintRun._collect(results, max_issues=3)
+        self.assertEqual(["x", "y"], names)
+        self.assertEqual([["a", "b"], ["c"]], stdouts)
+        self.assertEqual([["err"], []], stderrs)
+        self.assertEqual(("z", ["d"], []), next(results))
+
+    def test_no_max_issues(self):
+        """Should collect all results when there's no threshold."""
+        results = [("x", ["a"], []), ("y", ["b"], [])]
+        _, stdouts, _ = _LintRun._collect(results, max_issues=None)
+        self.assertEqual([["a"], ["b"]], stdouts)
+
+    def test_tier_gate(self):
+        """Next tiers should run only if the current one has no issues."""
+        self.assertTrue(_LintRun._should_stop([["a"], []], False, None))
+        self.assertFalse(_LintRun._should_stop([[], []], False, None))
+
+    def test_all_tiers(self):
+        """All tiers should run unless the threshold is met."""
+        self.assertFalse(_LintRun._should_stop([["a"]], True, None))
+        self.assertTrue(_LintRun._should_stop([["a"]], True, 1))
+
+    def test_finished_in_process(self):
+        """Linters should finish when all their in-process jobs finish."""
+        run = _LintRun(Mock(), Mock(), False)
+        run._pending.update(["a", "b", "b"])
+        run._set_finished([("a", "b")])
+        self.assertEqual(["a"], run.finished_linters)
+        run._set_finished(["b"])
+        self.assertEqual(["a", "b"], run.finished_linters)
+
+    def test_split(self):
+        """Files should be split into chunks of about the same size."""
+        chunks = _split([str(i) for i in range(100)])
+        self.assertEqual(100, sum(len(chunk) for chunk in chunks))
+        self.assertEqual([], _split([]))
+
+    def test_job_peak_memory(self):
+        """Jobs should return their results followed by their peak memory."""
+        result = _run_job((lambda args: ("x", [args], []), "a"))
+        self.assertEqual(("x", ["a"], []), result[:-1])
+        self.assertGreater(result[-1], 0)
+
+
+class TestStartup(unittest.TestCase):
+    """Guard the time to import the CLI, measured by ``-X importtime``."""
+
+    #: int: Budget in microseconds to import yala.main and its modules.
+    BUDGET = 100_000
+    #: tuple: Modules that only some commands need.
+    LAZY = ("asyncio", "docopt", "logging.config", "multiprocessing",
+            "sqlite3", "yala.engine", "yala.linters",
+            "yala.store")  # fmt: skip
+
+    def test_lazy_imports(self):
+        """Modules that only some commands need should not be imported."""
+        imported = self._import_times()
+        for module in self.LAZY:
+            self.assertNotIn(module, imported)
+
+    def test_budget(self):
+        """Importing yala.main should take less than the budget."""
+        # The fastest run, to discard noise from other processes
+        elapsed = min(self._import_times()["yala.main"] for _ in range(3))
+        self.assertLess(elapsed, self.BUDGET)
+
+    @staticmethod
+    def _import_times():
+        """Return the cumulative import time of each module."""
+        stderr = subprocess.run(  # nosec
+            [sys.executable, "-X", "importtime", "-c", "import yala.main"],
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        ).stderr
+        # E.g. "import time:       101 |       1234 |   yala.config"
+        times = {}
+        for line in stderr.splitlines()[1:]:
+            _, cumulative, module = line.split("|")
+            times[module.strip()] = int(cumulative)
+        return times
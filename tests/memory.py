@@ -0,0 +1,98 @@
+"""Tests for the memory module."""
+import subprocess  # nosec
+import sys
+import threading
+import time
+import unittest
+from multiprocessing.pool import ThreadPool
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from yala.memory import (Admission, MemoryStats, get_job_peak, start_job,
+                         wait_process)
+
+
+class TestAdmission(unittest.TestCase):
+    """Test memory-aware scheduling."""
+
+    def setUp(self):
+        """Track the projected memory of running jobs."""
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.highest = 0
+        self.pool = ThreadPool(4)
+        self.addCleanup(self.pool.terminate)
+
+    def test_budget(self):
+        """Running jobs should never exceed the budget."""
+        stats = MemoryStats()
+        stats.peaks.update({"big": 60, "small": 30})
+        jobs = [("big", 60), ("small", 30), ("small", 30), ("big", 60)]
+        results = list(Admission(self.pool, stats, 100).imap_unordered(
+            self._run, jobs))  # fmt: skip
+        self.assertEqual(4, len(results))
+        self.assertLessEqual(self.highest, 100)
+
+    def test_oversized_job(self):
+        """A job larger than the budget should run alone."""
+        stats = MemoryStats()
+        stats.peaks.update({"huge": 200, "small": 30})
+        jobs = [("huge", 200), ("small", 30)]
+        list(Admission(self.pool, stats, 100).imap_unordered(self._run, jobs))
+        self.assertEqual(200, self.highest)
+
+    def test_stats(self):
+        """The highest peak of each job key should be recorded."""
+        stats = MemoryStats()
+        jobs = [("a", 10), ("a", 30), ("b", 5)]
+        results = Admission(self.pool, stats).imap_unordered(self._run, jobs)
+        self.assertEqual([("done",)] * 3, list(results))
+        self.assertEqual({"a": 30, "b": 5}, stats.peaks)
+
+    def test_unwritable_cache(self):
+        """A cache folder that can't be written should only log a warning."""
+        with TemporaryDirectory() as tmp_dir:
+            # A file where the cache folder should be
+            cache_dir = Path(tmp_dir, "file")
+            cache_dir.touch()
+            stats = MemoryStats(cache_dir)
+            stats.update("a", 10)
+            with self.assertLogs("yala.cache", "WARNING"):
+                stats.save()
+
+    def _run(self, memory):
+        """Use ``memory`` for a while and return it as the peak."""
+        with self.lock:
+            self.in_use += memory
+            self.highest = max(self.highest, self.in_use)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_use -= memory
+        return "done", memory
+
+
+class TestPeak(unittest.TestCase):
+    """Test peak memory measurement."""
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "Linux RSS")
+    def test_subprocess_peak(self):
+        """The peak of a linter subprocess should be recorded."""
+        code = "import time; x = bytearray(64 << 20); time.sleep(0.5)"
+        start_job()
+        with subprocess.Popen([sys.executable, "-c", code]) as process:
+            wait_process(process)
+        self.assertEqual(0, process.returncode)
+        self.assertGreater(get_job_peak(), 64 * 1024)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "Linux RSS")
+    def test_inherited_memory(self):
+        """The memory of this process should not count as the linter's."""
+        buffer = bytearray(256 << 20)
+        for page in range(0, len(buffer), 4096):
+            buffer[page] = 1
+        start_job()
+        code = "import time; time.sleep(0.2)"
+        with subprocess.Popen([sys.executable, "-c", code]) as process:
+            wait_process(process)
+        del buffer
+        self.assertLess(get_job_peak(), 128 * 1024)
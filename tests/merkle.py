@@ -0,0 +1,66 @@
+"""Tests for the merkle module."""
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from yala.merkle import MerkleTree
+
+
+class TestMerkleTree(unittest.TestCase):
+    """Test file and folder hashes."""
+
+    def setUp(self):
+        """Create two packages and a loose module."""
+        tmp = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.files = [self._path(path) for path in (
+            "a/__init__.py", "a/sub/__init__.py", "a/sub/mod.py",
+            "b/__init__.py", "b/mod.py", "script.py",
+        )]  # fmt: skip
+        for path in self.files:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(f"# {path}\n", "utf-8")
+
+    def _path(self, path):
+        """Return a path in the temporary folder."""
+        return os.path.join(self.tmp, *path.split("/"))
+
+    def test_packages(self):
+        """Top-level packages should include their subpackages."""
+        packages = MerkleTree(self.files).get_packages()
+        expected = {self._path("a"): self.files[:3],
+                    self._path("b"): self.files[3:5]}  # fmt: skip
+        self.assertEqual(expected, packages)
+
+    def test_changed_subtree(self):
+        """Only folders above a changed file should get a new hash."""
+        before = MerkleTree(self.files).folders
+        Path(self.files[2]).write_text("x = 1\n", "utf-8")
+        after = MerkleTree(self.files).folders
+        for folder in ("a", "a/sub"):
+            self.assertNotEqual(before[self._path(folder)],
+                                after[self._path(folder)])  # fmt: skip
+        self.assertEqual(before[self._path("b")], after[self._path("b")])
+
+    def test_added_file(self):
+        """Adding a file should change the hash of its folder."""
+        before = MerkleTree(self.files).folders
+        new = self._path("b/new.py")
+        Path(new).write_text("", "utf-8")
+        after = MerkleTree(self.files + [new]).folders
+        self.assertNotEqual(before[self._path("b")], after[self._path("b")])
+        self.assertEqual(before[self._path("a")], after[self._path("a")])
+
+    def test_cache(self):
+        """Files with the same size and time should not be read again."""
+        cache_dir, path = self._path(".cache"), self.files[4]
+        digest = MerkleTree(self.files, cache_dir).digests[path]
+        stat = os.stat(path)
+        Path(path).write_text("# changed\n", "utf-8")
+        os.truncate(path, stat.st_size)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        cached = MerkleTree(self.files, cache_dir)
+        self.assertEqual(digest, cached.digests[path])
+        self.assertNotEqual(digest, MerkleTree(self.files).digests[path])
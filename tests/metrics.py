@@ -0,0 +1,55 @@
+"""Tests for the metrics module."""
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from yala.metrics import RadonMetrics, get_cc_rank, get_mi_rank
+
+
+class TestRanks(unittest.TestCase):
+    """Test radon ranks of raw values."""
+
+    def test_cc_rank(self):
+        """Ranks should match radon's complexity limits."""
+        ranks = [get_cc_rank(value) for value in (1, 5, 6, 10, 11, 21, 41)]
+        self.assertEqual(list("AABBCDF"), ranks)
+
+    def test_mi_rank(self):
+        """Ranks should match radon's maintainability index limits."""
+        ranks = [get_mi_rank(value) for value in (0, 9, 9.5, 19, 19.5)]
+        self.assertEqual(list("CCBBA"), ranks)
+
+
+class TestRadonMetrics(unittest.TestCase):
+    """Test cached metrics."""
+
+    def setUp(self):
+        """Work in a temporary folder."""
+        tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp_dir.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_thresholds(self):
+        """Any threshold should be applied to cached values."""
+        metrics = self._measure("def f(a):\n    return a or 1\n", "v1")
+        self.assertEqual([], metrics.get_results())
+        results = metrics.get_results(cc_min="A", mi_min="D")
+        self.assertEqual(["f - A (2)"], [result.msg for result in results])
+
+    def test_dropped(self):
+        """Blocks should be compared with the previous version of a file."""
+        self._measure("def f(a):\n    return a\n", "v1")
+        ifs = "".join(f"    if a == {i}:\n        return {i}\n"
+                      for i in range(6))  # fmt: skip
+        metrics = self._measure(f"def f(a):\n{ifs}", "v2")
+        results = metrics.get_results(cc_min="A", dropped=True)
+        self.assertEqual(["f - B (7), was A"],
+                         [result.msg for result in results])  # fmt: skip
+
+    @staticmethod
+    def _measure(source, digest):
+        Path("mod.py").write_text(source, "utf-8")
+        return RadonMetrics({"mod.py": digest}, "cache")
@@ -0,0 +1,32 @@
+"""Tests for the registry module."""
+import unittest
+
+from yala import linters
+from yala.base import Linter
+from yala.registry import LINTERS, LinterRegistry
+
+
+class TestLinterRegistry(unittest.TestCase):
+    """Test resolving linter names to classes."""
+
+    def test_all_linters(self):
+        """Every linter class should be registered by its name."""
+        classes = {LINTERS[name] for name in LINTERS}
+        self.assertEqual(set(Linter.__subclasses__()), classes)
+        for name in LINTERS:
+            self.assertEqual(name, LINTERS[name].name)
+
+    def test_lazy_lookup(self):
+        """Names should be known without importing their modules."""
+        registry = LinterRegistry({"fake": "no_such_module:Fake"})
+        self.assertIn("fake", registry)
+        self.assertNotIn("other", registry)
+        self.assertEqual(["fake"], list(registry))
+        with self.assertRaises(ImportError):
+            registry["fake"]  # pylint: disable=pointless-statement
+
+    def test_deprecated_import(self):
+        """``yala.linters.LINTERS`` should still work, with a warning."""
+        with self.assertWarns(DeprecationWarning):
+            old_linters = getattr(linters, "LINTERS")
+        self.assertIs(LINTERS, old_linters)
@@ -0,0 +1,254 @@
+"""Scheduling and latency tests with fake linters.
+
+Fake linters are real subprocesses run by a real process pool, so these
+tests are slower than the others, but don't depend on installed linters.
+"""
+import asyncio
+import json
+import os
+import time
+import unittest
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from yala.main import LinterRunner, Main
+
+from .fake_linter import FAKE_LINTERS, FakeConfig
+
+#: float: Delay of linters that should never be waited for.
+_SLOW = 60
+
+
+class TestScheduling(unittest.TestCase):
+    """Test Main.lint scheduling with fake linters."""
+
+    def setUp(self):
+        """Keep caches in a temporary folder."""
+        tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_dir = tmp_dir.name
+
+    @unittest.skipIf((os.cpu_count() or 1) < 2, "Needs 2 or more CPUs.")
+    def test_parallel(self):
+        """Linters of the same tier should run in parallel."""
+        options = {
+            "linters": "fake flake8, fake pylint",
+            "fake flake8 args": "--delay 1",
+            "fake pylint args": "--delay 1",
+        }
+        stdout, _, elapsed = self._lint(options)
+        self.assertEqual(2, len(stdout))
+        self.assertLess(elapsed, 1.9)
+
+    def test_fail_fast(self):
+        """Should not wait for slow linters after the first issue."""
+        options = {
+            "linters": "fake flake8, fake pylint",
+            "fake pylint args": f"--delay {_SLOW}",
+        }
+        stdout, _, elapsed = self._lint(options, max_issues=1)
+        self.assertEqual(["fake flake8"], self._get_linters(stdout))
+        self.assertLess(elapsed, _SLOW / 2)
+
+    def test_max_issues(self):
+        """Should wait until the number of issues is reached."""
+        options = {
+            "linters": "fake flake8, fake pylint, fake mypy",
+            "fake pylint args": "--delay 0.5 --count 2",
+            "fake mypy args": f"--delay {_SLOW}",
+        }
+        stdout, _, elapsed = self._lint(options, max_issues=3)
+        self.assertEqual(3, len(stdout))
+        self.assertLess(elapsed, _SLOW / 2)
+
+    def test_tier_gate(self):
+        """The second tier should not run if the first one has issues."""
+        options = {
+            "linters": "fake flake8, fake pylint",
+            "tiers": "fake flake8\nfake pylint",
+            "fake pylint args": f"--delay {_SLOW}",
+        }
+        stdout, _, elapsed = self._lint(options)
+        self.assertEqual(["fake flake8"], self._get_linters(stdout))
+        self.assertLess(elapsed, _SLOW / 2)
+
+    def test_speculative(self):
+        """Speculative tiers should be discarded if a tier has issues."""
+        options = {
+            "linters": "fake flake8, fake pylint",
+            "tiers": "fake flake8\nfake pylint",
+            "fake flake8 args": "--delay 0.5",
+        }
+        stdout, _, _ = self._lint(options, speculative=True)
+        self.assertEqual(["fake flake8"], self._get_linters(stdout))
+
+    def test_all_tiers(self):
+        """All tiers should run when requested."""
+        options = {
+            "linters": "fake flake8, fake pylint",
+            "tiers": "fake flake8\nfake pylint",
+        }
+        stdout, _, _ = self._lint(options, all_tiers=True)
+        expected = ["fake flake8", "fake pylint"]
+        self.assertEqual(expected, self._get_linters(stdout))
+
+    def test_large_output(self):
+        """All results of large outputs should be parsed."""
+        count = 100_000
+        options = {
+            "linters": "fake pylint, fake black",
+            "fake pylint args": f"--count {count}",
+            "fake black args": f"--count {count}",
+        }
+        stdout, stderr, _ = self._lint(options)
+        self.assertEqual(2 * count, len(stdout))
+        self.assertEqual([], stderr)
+
+    def _lint(self, options, **kwargs):
+        """Return stdout, stderr and elapsed time of a lint call."""
+        config = self._get_config(options)
+        start = time.monotonic()
+        stdout, stderr = Main(config, FAKE_LINTERS).lint(["fake.py"], **kwargs)
+        return stdout, list(stderr), time.monotonic() - start
+
+    def _get_config(self, options):
+        """Return a config with ``options`` and the temporary cache folder."""
+        return FakeConfig(
+            FAKE_LINTERS, {"cache dir": self.cache_dir, **options}
+        )
+
+    @staticmethod
+    def _get_linters(stdout):
+        """Return the names of the linters with results."""
+        return sorted({result.linter_name for result in stdout})
+
+    def test_summary(self):
+        """Workers should count results instead of sending them."""
+        options = {
+            "linters": "fake pylint, fake flake8",
+            "fake pylint args": "--count 1000",
+            "fake flake8 args": "--count 10",
+        }
+        config = self._get_config(options)
+        summary, _ = Main(config, FAKE_LINTERS).summarize(["fake.py"])
+        self.assertEqual(1010, len(summary))
+        self.assertEqual(1000, summary.by_rule[("fake pylint", "C9999")])
+
+
+class TestResources(unittest.TestCase):
+    """Test memory use and termination of linter processes."""
+
+    def setUp(self):
+        """Keep caches and pid files in a temporary folder."""
+        tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = Path(tmp_dir.name)
+
+    @unittest.skipUnless(hasattr(os, "wait4"), "Needs os.wait4.")
+    def test_memory_budget(self):
+        """Linters should not run together if their peaks exceed the budget.
+
+        Threads run linter subprocesses concurrently even with one CPU.
+        Without a budget, peaks are not recorded. A run with a large budget
+        records them and the next one, with a small budget, uses them.
+        """
+        options = {
+            "linters": "fake flake8, fake pylint",
+            "cache dir": str(self.tmp_dir),
+            "fake flake8 args": "--memory 100 --delay 1",
+            "fake pylint args": "--memory 100 --delay 1",
+        }
+        self.assertLess(self._lint(options), 1.9)
+        self.assertFalse((self.tmp_dir / "memory.json").exists())
+        options["max memory"] = "10G"
+        self._lint(options)
+        peaks = json.loads((self.tmp_dir / "memory.json").read_text())
+        self.assertGreater(peaks["fake flake8"], 100 * 1024)
+        self.assertGreater(peaks["fake pylint"], 100 * 1024)
+        options["max memory"] = "150M"
+        self.assertGreater(self._lint(options), 2)
+
+    def test_cancelled_linter_killed(self):
+        """Linters cancelled by --fail-fast should not keep running.
+
+        The pool needs two workers, so both linters start even with one CPU.
+        """
+        pid_file = self.tmp_dir / "pylint.pid"
+        options = {
+            "linters": "fake flake8, fake pylint",
+            "cache dir": str(self.tmp_dir),
+            "fake flake8 args": "--delay 0.5",
+            "fake pylint args": f"--delay {_SLOW} --pid-file {pid_file}",
+        }
+        config = FakeConfig(FAKE_LINTERS, options)
+        start = time.monotonic()
+        with patch("os.cpu_count", return_value=2):
+            Main(config, FAKE_LINTERS).lint(["fake.py"], max_issues=1)
+        self.assertLess(time.monotonic() - start, _SLOW / 2)
+        pid = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while _is_running(pid) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        self.assertFalse(_is_running(pid))
+
+    @staticmethod
+    def _lint(options):
+        """Return the time to lint with a pool of threads."""
+        config = FakeConfig(FAKE_LINTERS, options)
+        with ThreadPool(2) as pool:
+            start = time.monotonic()
+            Main(config, FAKE_LINTERS, pool=pool).lint(["fake.py"])
+            return time.monotonic() - start
+
+
+def _is_running(pid):
+    """Whether a process exists and is not a zombie."""
+    try:
+        status = Path(f"/proc/{pid}/status").read_text("utf-8")
+    except FileNotFoundError:
+        return False
+    except OSError:  # no /proc: only check existence
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+    return "\nState:\tZ" not in status
+
+
+class TestReentrancy(unittest.TestCase):
+    """Concurrent runs should not share state."""
+
+    def test_concurrent_reports(self):
+        """Runs with different configs should share a pool concurrently."""
+        counts = [3, 5, 7]
+        with TemporaryDirectory() as cache_dir, Pool(
+            initializer=LinterRunner.init_worker
+        ) as pool:
+            mains = [self._get_main(count, pool, cache_dir)
+                     for count in counts]  # fmt: skip
+            reports = asyncio.run(self._get_reports(mains))
+        for count, report in zip(counts, reports):
+            self.assertEqual(count, len(report.results))
+            self.assertEqual(["fake flake8"], report.finished_linters)
+
+    @staticmethod
+    async def _get_reports(mains):
+        """Await reports of all ``mains`` at the same time."""
+        return await asyncio.gather(
+            *(main.get_report_async(["fake.py"]) for main in mains)
+        )
+
+    @staticmethod
+    def _get_main(count, pool, cache_dir):
+        """Return a Main whose fake flake8 finds ``count`` issues."""
+        options = {
+            "linters": "fake flake8",
+            "cache dir": cache_dir,
+            "fake flake8 args": f"--count {count} --delay 0.2",
+        }
+        config = FakeConfig(FAKE_LINTERS, options)
+        return Main(config, FAKE_LINTERS, pool=pool)
@@ -0,0 +1,62 @@
+"""Tests for the snapshot module."""
+import os
+import subprocess  # nosec
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from yala.snapshot import StagedSnapshot
+
+
+class TestStagedSnapshot(unittest.TestCase):
+    """Test snapshots of the git index."""
+
+    def setUp(self):
+        """Create a repository with staged and unstaged changes."""
+        tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+        self._write({"pkg/a.py": "A = 1\n", "pkg/b.py": "B = 1\n",
+                     "c.py": "C = 1\n", "docs/conf.py": ""})  # fmt: skip
+        self._git("init", "-q")
+        self._git("add", ".")
+        self._git("-c", "user.name=yala", "-c", "user.email=yala@localhost",
+                  "commit", "-qm", "First commit")  # fmt: skip
+        self._write({"pkg/a.py": "A = 2\n"})
+        self._git("add", "pkg/a.py")
+        self._write({"pkg/a.py": "A = 3\n", "pkg/b.py": "B = 3\n"})
+        work_dir = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, work_dir)
+
+    def test_staged_contents(self):
+        """Changed files should have their staged contents."""
+        with StagedSnapshot() as snapshot:
+            path = Path(snapshot.path)
+            self.assertEqual("A = 2\n", (path / "pkg/a.py").read_text())
+            self.assertEqual("B = 1\n", (path / "pkg/b.py").read_text())
+            self.assertTrue((path / "c.py").is_symlink())
+            staged = str(path / "pkg" / "a.py")
+            self.assertEqual([staged], snapshot.get_targets(["."]))
+            self.assertEqual([], snapshot.get_targets(["c.py"]))
+            self.assertEqual("pkg/a.py", snapshot.get_original_path(staged))
+        self.assertFalse(path.exists())
+
+    def test_unchanged_folder(self):
+        """Targets from a folder without changes should be in the snapshot."""
+        os.chdir("docs")
+        with StagedSnapshot() as snapshot:
+            targets = snapshot.get_targets(["../pkg"])
+            self.assertEqual([os.path.join(snapshot.path, "pkg", "a.py")],
+                             targets)  # fmt: skip
+            original = snapshot.get_original_path(targets[0])
+            self.assertEqual("../pkg/a.py", original)
+
+    def _write(self, contents):
+        for path, content in contents.items():
+            path = self.root / path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+    def _git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True)  # nosec
@@ -0,0 +1,66 @@
+"""Tests for the store module."""
+import os
+import unittest
+
+from yala.base import LinterOutput
+from yala.store import ResultStore
+
+
+class TestResultStore(unittest.TestCase):
+    """Test the SQLite result store."""
+
+    def setUp(self):
+        """Create an in-memory database with two runs."""
+        self.store = ResultStore(":memory:")
+        self.addCleanup(self.store.close)
+        first = [
+            LinterOutput("pycodestyle", "a.py", "E501 line too long", 1, 80),
+            LinterOutput("pycodestyle", "b.py", "E211 whitespace", 2, 3),
+        ]
+        linted = [("pycodestyle", "a.py", "1"), ("pycodestyle", "b.py", "1")]
+        self.store.add_run(linted, first)
+        # Incremental run: only a.py was linted again
+        second = [
+            LinterOutput("pycodestyle", "a.py", "E501 line too long", 2, 80),
+            LinterOutput("pycodestyle", "a.py", "W291 trailing space", 3, 1),
+        ]
+        self.run_id = self.store.add_run(
+            [("pycodestyle", "a.py", "2")], second
+        )
+
+    def test_current_results(self):
+        """Unchanged files should keep the results of the previous run."""
+        results = sorted(self.store.get_current_results())
+        expected = [("a.py", 2, "E501"), ("a.py", 3, "W291"),
+                    ("b.py", 2, "E211")]  # fmt: skip
+        actual = [(r.path, r.line_nr, r.rule) for r in results]
+        self.assertEqual(expected, actual)
+
+    def test_new_results(self):
+        """Only results not found by the previous run should be new."""
+        results = self.store.get_new_results(self.run_id)
+        self.assertEqual(["W291"], [result.rule for result in results])
+
+    def test_counts(self):
+        """Count current results by file and by rule."""
+        self.assertEqual(
+            [("a.py", 2), ("b.py", 1)], self.store.count_by_file()
+        )
+        by_rule = self.store.count_by_rule()
+        self.assertIn(("pycodestyle", "W291", 1), by_rule)
+        self.assertEqual(3, sum(total for _, _, total in by_rule))
+
+    def test_absolute_paths(self):
+        """Results with absolute paths should be replaced by relative ones."""
+        absolute = os.path.abspath("b.py")
+        self.store.add_run(
+            [("black", "b.py", "1")],
+            [LinterOutput("black", absolute, "would reformat", None, None)],
+        )
+        # b.py was fixed and linted again, given as a relative path
+        run_id = self.store.add_run([("black", "b.py", "2")], [])
+        current = [result for result in self.store.get_current_results()
+                   if result.linter_name == "black"]  # fmt: skip
+        self.assertEqual([], current)
+        self.assertEqual([], self.store.get_new_results(run_id))
+        self.assertEqual({"b.py": "2"}, self.store.get_digests("black"))
@@ -0,0 +1,40 @@
+"""Tests for the summary module."""
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from yala.base import LinterOutput
+from yala.summary import Summary
+
+
+class TestSummary(unittest.TestCase):
+    """Test issue counts."""
+
+    def setUp(self):
+        """Count results of two linters."""
+        self.summary = Summary().update(
+            LinterOutput("pycodestyle", f"{path}.py", f"{rule} message", 1)
+            for path, rule in (("a", "E501"), ("a", "E501"), ("b", "W291"))
+        )
+        pylint = Summary().update(
+            [LinterOutput("pylint", "b.py", "Bad (C0114, bad-thing)", 1)]
+        )
+        self.summary.merge(pylint)
+
+    def test_counts(self):
+        """Count results by linter, rule and file."""
+        self.assertEqual(4, len(self.summary))
+        self.assertEqual(3, self.summary.by_linter["pycodestyle"])
+        self.assertEqual(2, self.summary.by_rule[("pycodestyle", "E501")])
+        self.assertEqual(1, self.summary.by_rule[("pylint", "C0114")])
+        self.assertEqual(2, self.summary.by_file["b.py"])
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_top(self, mock_stdout):
+        """Only the top rules and files should be printed."""
+        self.summary.print(top=1)
+        lines = mock_stdout.getvalue().splitlines()
+        self.assertIn("Top 1 rules:", lines)
+        rules = lines[lines.index("Top 1 rules:") + 1]
+        self.assertTrue(rules.endswith(" E501 [pycodestyle]"), rules)
+        self.assertNotIn("W291", mock_stdout.getvalue())
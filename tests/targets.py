@@ -0,0 +1,47 @@
+"""Tests for the targets module."""
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from yala.targets import TargetFilter, expand_targets
+
+
+class TestTargetFilter(unittest.TestCase):
+    """Test skipping files before linting."""
+
+    def setUp(self):
+        """Create a tree with generated, vendored and large files."""
+        self._tmp = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self._tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self._tmp.name)
+        files = {
+            "pkg/mod.py": "# Not generated, edit at will\n",
+            "pkg/mod_pb2.py": "# Generated by the protocol buffer compiler."
+                              "  DO NOT EDIT!\n",
+            "pkg/gen.py": '"""Docs."""\n# @generated by a tool\n',
+            "pkg/vendor/lib.py": "x = 1\n",
+            "pkg/big.py": "x = 1\n" * 1000,
+        }  # fmt: skip
+        for path, content in files.items():
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(content, "utf-8")
+
+    def test_no_filter(self):
+        """All files should be kept by default."""
+        target_filter = TargetFilter()
+        self.assertFalse(target_filter)
+        self.assertEqual(5, len(list(expand_targets(["pkg"], target_filter))))
+
+    def test_skipped(self):
+        """Generated, vendored and oversized files should be skipped."""
+        target_filter = TargetFilter(1024, True, ["*/vendor/*"])
+        files = list(expand_targets(["pkg", "pkg/gen.py"], target_filter))
+        self.assertEqual([str(Path("pkg/mod.py"))], files)
+        self.assertEqual({"generated": 2, "vendored": 1, "oversized": 1},
+                         target_filter.skipped)  # fmt: skip
+        skipped = ("pkg/mod_pb2.py", "pkg/gen.py", "pkg/vendor/lib.py",
+                   "pkg/big.py")  # fmt: skip
+        self.assertEqual(sum(Path(path).stat().st_size for path in skipped),
+                         target_filter.skipped_bytes)  # fmt: skip
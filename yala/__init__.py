@@ -1,11 +1,21 @@
 """Root logger configuration."""
-import logging.config
 from pathlib import Path
 
 __version__ = "3.2.0"
 
 CONFIG_PATH = Path(__file__).parent / "logging.ini"
-# The file is from this package, so we ignore the issue after checking our
-# logging.ini file.
-# skipcq: PY-A6006
-logging.config.fileConfig(CONFIG_PATH, disable_existing_loggers=False)
+
+
+def configure_logging():
+    """Configure logging from our logging.ini file, e.g. for the CLI.
+
+    It's not done at import time, so importing yala is fast and doesn't
+    change the logging configuration of other applications.
+    """
+    # logging.config is only needed by the CLI and takes long to import.
+    import logging.config  # pylint: disable=import-outside-toplevel
+
+    # The file is from this package, so we ignore the issue after checking our
+    # logging.ini file.
+    # skipcq: PY-A6006
+    logging.config.fileConfig(CONFIG_PATH, disable_existing_loggers=False)
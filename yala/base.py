@@ -1,9 +1,56 @@
 """Parser module to abstract different parsers."""
-import logging
+import hashlib
+import re
 from abc import ABCMeta, abstractmethod
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional, Pattern, Sequence
 
-LOG = logging.getLogger(__name__)
+#: int: Approximate size of output chunks parsed at once.
+_CHUNK_SIZE = 1 << 20
+#: int: Maximum text carried to the next chunk for multi-line results.
+_MAX_TAIL = 1 << 16
+
+
+class LazyPattern:
+    """Class attribute compiled into a regex when it's first read.
+
+    Linters are defined at import time, but most runs use a few of them, so
+    their patterns are compiled only when needed. The compiled regex then
+    replaces this descriptor in the class.
+    """
+
+    # Only the descriptor protocol is needed.
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, pattern, flags=0):
+        """Keep the arguments of :func:`re.compile`."""
+        self._pattern = pattern
+        self._flags = flags
+        self._name = None
+
+    def __set_name__(self, owner, name):
+        """Remember the attribute name to replace it later."""
+        self._name = name
+
+    def __get__(self, obj, owner=None):
+        """Compile the pattern and store it in the class."""
+        compiled = re.compile(self._pattern, self._flags)
+        setattr(owner or type(obj), self._name, compiled)
+        return compiled
+
+
+@lru_cache(maxsize=None)
+def _get_rule_patterns():
+    """Return patterns to find the rule code in linter messages."""
+    return (
+        # e.g. pylint's "Unused import os (W0611, unused-import)"
+        re.compile(r"\((?P<rule>[A-Z]\d{4}), (?P<symbol>[\w-]+)\)$"),
+        # e.g. mypy's 'Need type annotation for "x"  [var-annotated]'
+        re.compile(r"\s\[(?P<rule>[a-z][\w-]+)\]$"),
+        # e.g. "E211 whitespace" (pycodestyle, flake8) and "D100: Missing"
+        re.compile(r"^(?P<rule>[A-Z]+\d+):?\s"),
+    )
 
 
 class LinterOutput:
@@ -33,6 +80,29 @@ class LinterOutput:
         self.msg = msg
         self.col = col
 
+    @property
+    def linter_name(self):
+        """Name of the linter that produced this result."""
+        return self._linter_name
+
+    @property
+    def rule(self):
+        """Rule code found in the message, e.g. "E501", or ``None``."""
+        rules = self.rules
+        return rules[0] if rules else None
+
+    @property
+    def rules(self):
+        """All codes of the rule, e.g. pylint's ``("W0611", "unused-import")``.
+
+        Empty if the message has no rule code.
+        """
+        for pattern in _get_rule_patterns():
+            match = pattern.search(self.msg)
+            if match:
+                return tuple(code for code in match.groups() if code)
+        return ()
+
     def __str__(self):
         """Output shown to the user."""
         return (
@@ -70,6 +140,44 @@ class Linter(metaclass=ABCMeta):
     #: str: Name of this linter. Recommended to be the same as its command.
     name = ""
 
+    #: str: Python distribution of the linter, to find its version. Defaults
+    #: to :attr:`name`.
+    distribution = ""
+
+    #: str: Folder for caches managed by yala.
+    cache_dir = None
+
+    #: bool: Whether the linter's own cache is kept in :attr:`cache_dir`, one
+    #: per configuration, instead of where the linter keeps it.
+    manage_cache = False
+
+    #: bool: Whether results of a file depend on the modules it imports.
+    cross_module = False
+
+    #: bool: Whether results of a file depend on all other files, e.g.
+    #: duplicate code. A change in any file lints all of them again.
+    cross_file = False
+
+    #: Regex to parse results, if the linter parses by pattern. Subclasses
+    #: may set a :class:`LazyPattern`.
+    pattern: Optional[Pattern[str]] = None
+
+    #: Compiled regex to parse many output lines at once. Defaults to
+    #: :attr:`pattern` matching lines with ``^`` and ``$``.
+    buffer_pattern: Optional[Pattern[str]] = None
+
+    #: bool: Whether results are in stderr instead of stdout.
+    results_in_stderr = False
+
+    #: list: Rules to ignore, from yala's configuration.
+    ignored_rules: Sequence[str] = ()
+
+    #: Compiled regex matching the rule codes this linter can disable.
+    rule_pattern: Optional[Pattern[str]] = None
+
+    #: str: Option that disables rules, formatted with comma-separated codes.
+    ignore_option = ""
+
     @property
     def command(self):
         """Command to execute. Defaults to :attr:`name`.
@@ -81,10 +189,54 @@ class Linter(metaclass=ABCMeta):
 
     @property
     def command_with_options(self):
-        """Add arguments from config to :attr:`command`."""
+        """Add ignored rules and arguments from config to :attr:`command`.
+
+        Rules are disabled by the linter itself, so they are never checked.
+        """
+        options = [self.command]
+        ignore_options = self.get_ignore_options()
+        if ignore_options:
+            options.append(ignore_options)
         if "args" in self.config:
-            return " ".join((self.command, self.config["args"]))
-        return self.command
+            options.append(self.config["args"])
+        return " ".join(options)
+
+    def get_ignore_options(self):
+        """Return the options that disable this linter's ignored rules."""
+        rules = self._get_own_ignored_rules()
+        if not rules:
+            return ""
+        return self.ignore_option.format(",".join(rules))
+
+    def _get_own_ignored_rules(self):
+        """Ignored rules that this linter can disable."""
+        return [rule for rule in self.ignored_rules if self.owns_rule(rule)]
+
+    def owns_rule(self, rule):
+        """Whether this linter can disable the rule."""
+        return bool(self.rule_pattern and self.rule_pattern.fullmatch(rule))
+
+    @property
+    def env(self):
+        """Environment variables to set when running the linter."""
+        return {}
+
+    def _get_cache_dir(self):
+        """Return a cache folder for this linter and its configuration.
+
+        Different configurations don't share caches, because linters may
+        discard a cache built with other options.
+        """
+        options = self.get_ignore_options() + " " + self.config.get("args", "")
+        digest = hashlib.sha256(options.encode()).hexdigest()[:16]
+        folder = Path(self.cache_dir) / self.name.replace(" ", "_") / digest
+        return str(folder)
+
+    def prepare(self):
+        """Prepare to run the linter, e.g. create folders it needs.
+
+        Called right before running the linter, not when building its command.
+        """
 
     @abstractmethod
     def parse(self, stdout_lines, stderr_lines):
@@ -100,19 +252,66 @@ class Linter(metaclass=ABCMeta):
 
         """
 
-    def _get_relative_path(self, full_path):
-        """Return the relative path from current path."""
+    def parse_buffers(self, stdout, stderr):
+        """Parse whole linter outputs given as bytes-like objects.
+
+        Linters with a :attr:`pattern` are matched over chunks of many lines,
+        so there's no copy of the whole output nor a string per line. Other
+        linters receive decoded lines in :meth:`parse`.
+
+        Args:
+            stdout: Linter's standard output (e.g. ``bytes`` or ``mmap``).
+            stderr: Linter's standard error.
+
+        Returns:
+            iterable of LinterOutput: Linter results to print to stdout.
+            iterable of str: Lines to print to stderr.
+
+        """
+        if self.pattern is None:
+            return self.parse(_get_lines(stdout), _get_lines(stderr))
+        results, other = stdout, stderr
+        if self.results_in_stderr:
+            results, other = stderr, stdout
+        pattern = self.buffer_pattern or self._get_buffer_pattern()
+        return self._parse_buffer(results, pattern), _get_lines(other)
+
+    @classmethod
+    def _get_buffer_pattern(cls):
+        """Return :attr:`pattern` for matching many lines at once."""
+        if "_multiline_pattern" not in cls.__dict__:
+            cls._multiline_pattern = re.compile(
+                cls.pattern.pattern, cls.pattern.flags | re.MULTILINE
+            )
+        return cls._multiline_pattern
+
+    def _parse_buffer(self, buffer, pattern):
+        """Match pattern over decoded chunks of a buffer.
+
+        Multi-line patterns may match across chunks: the text after the last
+        match is prepended to the next chunk.
+        """
+        tail = ""
+        for chunk in _iter_chunks(buffer):
+            text = tail + chunk
+            end = 0
+            for match in pattern.finditer(text):
+                end = match.end()
+                params = match.groupdict() or match.groups()
+                yield self._create_output_from_match(params)
+            tail = _get_tail(text, end) if pattern.flags & re.DOTALL else ""
+
+    @staticmethod
+    def _get_relative_path(full_path):
+        """Return the relative path from current path.
+
+        Paths outside the current folder, e.g. of a staged snapshot that is
+        mapped back to the original files later, are returned unchanged.
+        """
         try:
-            rel_path = Path(full_path).relative_to(Path().absolute())
+            return str(Path(full_path).relative_to(Path().absolute()))
         except ValueError:
-            LOG.error(
-                "%s: Couldn't find relative path of '%s' from '%s'.",
-                self.name,
-                full_path,
-                Path().absolute(),
-            )
             return full_path
-        return str(rel_path)
 
     def _parse_by_pattern(self, lines, pattern):
         """Match pattern line by line and return LinterOutputs.
@@ -153,3 +352,34 @@ class Linter(metaclass=ABCMeta):
         if isinstance(match_result, dict):
             return LinterOutput(self.name, **match_result)
         return LinterOutput(self.name, *match_result)
+
+
+def _get_lines(output):
+    """Return non-empty lines of a bytes-like output."""
+    return [line for line in bytes(output).decode("utf-8").splitlines()
+            if line]  # fmt: skip
+
+
+def _iter_chunks(buffer):
+    """Yield decoded chunks of a bytes-like buffer, ending in full lines."""
+    start, length = 0, len(buffer)
+    while start < length:
+        end = buffer.find(b"\n", start + _CHUNK_SIZE)
+        end = length if end == -1 else end + 1
+        chunk = buffer[start:end].decode("utf-8")
+        if "\r" in chunk:
+            chunk = chunk.replace("\r\n", "\n")
+        yield chunk
+        start = end
+
+
+def _get_tail(text, start):
+    """Return the lines of ``text`` after ``start``, up to a size limit.
+
+    The limit keeps outputs with no matches from being scanned repeatedly.
+    """
+    tail = text[start:]
+    if len(tail) > _MAX_TAIL:
+        tail = tail[-_MAX_TAIL:]
+        tail = tail[tail.find("\n") + 1:]  # starting at a full line
+    return tail
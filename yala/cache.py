@@ -0,0 +1,33 @@
+"""JSON files that keep data between runs in the cache folder."""
+import json
+import logging
+
+LOG = logging.getLogger(__name__)
+
+
+def read_json_cache(path):
+    """Return the content of a cache file or an empty dict.
+
+    Args:
+        path (pathlib.Path): Cache file or ``None`` for no cache.
+
+    """
+    if path and path.is_file():
+        try:
+            return json.loads(path.read_text("utf-8"))
+        except ValueError:
+            LOG.warning("Ignoring invalid cache %s", path)
+    return {}
+
+
+def write_json_cache(path, content):
+    """Write a cache file, unless ``path`` is ``None``.
+
+    A cache that can't be written is only logged, so it never fails a run.
+    """
+    if path:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(content), "utf-8")
+        except OSError as error:
+            LOG.warning("Could not write cache %s: %s", path, error)
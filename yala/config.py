@@ -2,6 +2,7 @@
 import logging
 import re
 from configparser import ConfigParser
+from itertools import chain
 from pathlib import Path
 
 LOG = logging.getLogger(__name__)
@@ -17,8 +18,12 @@ class Config:
     _config = None
 
     _CFG_FILE = "setup.cfg"
+    #: str: Default folder for caches managed by yala.
+    _CACHE_DIR = ".yala_cache"
     #: str: Section of the config file.
     _CFG_SECTION = "yala"
+    #: dict: KiB per unit of size options, e.g. "max memory".
+    _MEMORY_UNITS = {"K": 1, "M": 1024, "G": 1024**2, "T": 1024**3}
 
     def __init__(self, all_linters):
         """Read default and user config files.
@@ -33,7 +38,9 @@ class Config:
         self._config = self._merge(default_cfg, user_cfg)
         self.user_linters = []  # chosen by the user
         self.linters = {}  # chosen by the user or all of them
+        self.tiers = []  # linter names grouped by execution order
         self._set_linters()
+        self._set_tiers()
 
     def _set_linters(self):
         """Use user-specified linters or all of them when not specified."""
@@ -44,6 +51,105 @@ class Config:
         else:
             self.linters = self._all_linters
 
+    def _set_tiers(self):
+        """Group linters by the "tiers" option, one tier per line.
+
+        Linters not in any tier are run in a last tier. Without the option,
+        there's only one tier with all linters.
+        """
+        for line in self._config.get("tiers", "").splitlines():
+            tier = [linter for linter in self._parse_linters_line(line)
+                    if linter in self.linters]  # fmt: skip
+            if tier:
+                self.tiers.append(tier)
+        tiered = set(chain.from_iterable(self.tiers))
+        untiered = [linter for linter in self.linters if linter not in tiered]
+        if untiered:
+            self.tiers.append(untiered)
+
+    @property
+    def cache_dir(self):
+        """Folder for caches managed by yala ("cache dir" option)."""
+        return self._config.get("cache dir", self._CACHE_DIR)
+
+    @property
+    def manage_caches(self):
+        """Whether mypy and black caches are kept in :attr:`cache_dir`."""
+        value = self._config.get("manage caches", "").strip().lower()
+        return ConfigParser.BOOLEAN_STATES.get(value, False)
+
+    @property
+    def in_process(self):
+        """Whether linters supported by :mod:`yala.engine` run in-process."""
+        value = self._config.get("in process", "").strip().lower()
+        return ConfigParser.BOOLEAN_STATES.get(value, False)
+
+    @property
+    def ignored_rules(self):
+        """Rule codes in the "ignore" option, e.g. ``["E501", "D203"]``."""
+        value = self._config.get("ignore", "")
+        return [rule for rule in re.split(r"[\s,]+", value) if rule]
+
+    @property
+    def per_file_ignores(self):
+        """Globs and rules ignored in matching files ("per file ignores").
+
+        E.g. "tests/*: D100, D103; migrations/*: *", where "*" ignores all
+        rules. Entries are separated by semicolons or lines.
+        """
+        value = self._config.get("per file ignores", "")
+        globs_rules = []
+        for entry in re.split(r"[;\n]", value):
+            glob, colon, rules = entry.partition(":")
+            if colon and glob.strip():
+                rules = [rule for rule in re.split(r"[\s,]+", rules) if rule]
+                globs_rules.append((glob.strip(), rules))
+            elif entry.strip():
+                LOG.warning("Invalid per file ignores: %s", entry.strip())
+        return globs_rules
+
+    @property
+    def max_memory(self):
+        """Memory budget in KiB ("max memory" option, e.g. "8G"), or ``None``.
+
+        Units are K, M, G or T (powers of 1024), optionally followed by "iB"
+        or "B".
+        """
+        return self._get_size("max memory")
+
+    @property
+    def max_file_size(self):
+        """Size in bytes of the largest file to lint, or ``None``.
+
+        Same format as :attr:`max_memory` ("max file size" option, e.g.
+        "1M").
+        """
+        size = self._get_size("max file size")
+        return size * 1024 if size is not None else None
+
+    @property
+    def skip_generated(self):
+        """Whether files with "generated" markers are not linted."""
+        value = self._config.get("skip generated", "").strip().lower()
+        return ConfigParser.BOOLEAN_STATES.get(value, False)
+
+    @property
+    def vendored(self):
+        """Glob patterns of files that are not linted ("vendored" option)."""
+        value = self._config.get("vendored", "")
+        return [glob for glob in re.split(r"[\s,]+", value) if glob]
+
+    def _get_size(self, option):
+        """Return a size option in KiB or ``None`` if not set or invalid."""
+        value = self._config.get(option, "").strip()
+        if not value:
+            return None
+        match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMGT])i?B?", value, re.I)
+        if not match:
+            LOG.warning("Invalid %s: %s", option, value)
+            return None
+        return int(float(match[1]) * self._MEMORY_UNITS[match[2].upper()])
+
     def print_config(self):
         """Print all yala configurations, including default and user's."""
         linters = self.user_linters or list(self.linters)
@@ -51,12 +157,18 @@ class Config:
         print("linters:", ", ".join(sorted(linters)))
         for key, value in self._config.items():
             if key != "linters":
+                value = value.replace("\n", "\n  ")  # multi-line values
                 print(f"{key}: {value}")
 
     def get_linter_classes(self):
         """Return linters to be executed."""
         return (self._all_linters[linter] for linter in self.linters)
 
+    def get_linter_tiers(self):
+        """Return linters to be executed grouped by tier, in order."""
+        return [[self._all_linters[linter] for linter in tier]
+                for tier in self.tiers]  # fmt: skip
+
     def _parse_cfg_linters(self):
         """Return valid linter names found in config files."""
         user_value = self._config.get("linters", "")
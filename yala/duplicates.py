@@ -0,0 +1,265 @@
+"""Find duplicated code across files, run as ``python -m yala.duplicates``.
+
+Pylint's duplicate-code check compares every pair of files. Here, each file
+is indexed once (in parallel with ``--jobs``) and the indexes are merged:
+
+1. Lines are normalized: comments, blank lines, docstrings, imports and
+   function signatures are dropped and tokens are separated by single
+   spaces.
+2. Each run of ``k`` normalized lines gets a rolling hash.
+3. Winnowing keeps the smallest hash of each window of ``w`` runs as a
+   fingerprint. Any duplicate of at least ``k + w - 1`` lines (the minimum
+   lines) shares a fingerprint.
+4. Files with the same fingerprint are compared line by line, extending the
+   match in both directions.
+
+Each duplicate is printed as "path:line: message", with both locations.
+"""
+import argparse
+import hashlib
+import io
+import os
+import sys
+import tokenize
+from collections import defaultdict
+from itertools import combinations
+from multiprocessing import Pool
+
+from .targets import expand_targets
+
+#: int: Modulus (a Mersenne prime) and base of rolling hashes.
+_MODULUS = (1 << 61) - 1
+_BASE = 1_000_003
+
+#: int: Fingerprints found in more files are boilerplate and not compared.
+_MAX_OCCURRENCES = 50
+
+#: set: Tokens that are not part of normalized lines.
+_SKIPPED_TOKENS = {tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE,
+                   tokenize.INDENT, tokenize.DEDENT, tokenize.ENCODING,
+                   tokenize.ENDMARKER}  # fmt: skip
+
+
+class FileIndex:
+    """Normalized lines and fingerprints of a file."""
+
+    # Only the attributes are needed.
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, path, min_lines):
+        """Read, normalize and fingerprint a file.
+
+        Args:
+            path (str): Python file.
+            min_lines (int): Minimum normalized lines of a duplicate.
+
+        Raises:
+            OSError: The file could not be read.
+            SyntaxError: The file could not be tokenized.
+
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            lines = get_normalized_lines(file.read())
+        #: list: Line number of each normalized line.
+        self.line_numbers = [number for number, _ in lines]
+        #: list: Hash of each normalized line.
+        self.hashes = [_hash_line(line) for _, line in lines]
+        #: list: Pairs of fingerprint and index of its first line.
+        self.fingerprints = _winnow(self.hashes, *_get_sizes(min_lines))
+
+
+def get_normalized_lines(source):
+    """Return the number and normalized text of each line with code.
+
+    Comments, blank lines, docstrings (statements with only strings),
+    imports and function signatures are dropped, as pylint does by default.
+    Tokens of a line are joined by single spaces, so formatting changes
+    don't hide duplicates.
+
+    Args:
+        source (bytes): Python source code.
+
+    Raises:
+        SyntaxError: The source could not be tokenized.
+
+    """
+    lines = []
+    statement = []
+    tokens = tokenize.tokenize(io.BytesIO(source).readline)
+    try:
+        for token in tokens:
+            if token.type == tokenize.NEWLINE:
+                lines += _get_statement_lines(statement)
+                statement = []
+            elif token.type not in _SKIPPED_TOKENS:
+                statement.append(token)
+    except tokenize.TokenError as error:
+        raise SyntaxError(str(error)) from error
+    return lines + _get_statement_lines(statement)
+
+
+def _get_statement_lines(tokens):
+    """Return the numbered lines of a statement, if it's not skipped."""
+    if not tokens:
+        return []
+    if all(token.type == tokenize.STRING for token in tokens):
+        return []  # docstring
+    first = [token.string for token in tokens[:2]]
+    if first[0] in ("import", "from", "def") or first == ["async", "def"]:
+        return []
+    lines = defaultdict(list)
+    for token in tokens:
+        lines[token.start[0]].append(token.string)
+    return [(number, " ".join(strings)) for number, strings in lines.items()]
+
+
+def _hash_line(line):
+    """Return a hash of a line that is the same in every process."""
+    digest = hashlib.blake2b(line.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % _MODULUS
+
+
+def _get_sizes(min_lines):
+    """Return the lines per hash (``k``) and hashes per window (``w``)."""
+    lines_per_hash = max(1, (min_lines + 1) // 2)
+    return lines_per_hash, min_lines - lines_per_hash + 1
+
+
+def _winnow(hashes, lines_per_hash, window):
+    """Return fingerprints: the smallest rolling hash of each window.
+
+    Rolling hashes are computed in one pass. The rightmost smallest hash of
+    a window is chosen, and it's only added once for consecutive windows.
+    """
+    rolling = []
+    value = 0
+    highest = pow(_BASE, lines_per_hash - 1, _MODULUS)
+    for index, line_hash in enumerate(hashes):
+        if index >= lines_per_hash:
+            value -= hashes[index - lines_per_hash] * highest
+        value = (value * _BASE + line_hash) % _MODULUS
+        if index >= lines_per_hash - 1:
+            rolling.append(value)
+    fingerprints = []
+    for start in range(len(rolling) - window + 1):
+        values = rolling[start:start + window]  # fmt: skip
+        smallest = min(values)
+        offset = window - 1 - values[::-1].index(smallest)
+        fingerprint = (smallest, start + offset)
+        if not fingerprints or fingerprints[-1] != fingerprint:
+            fingerprints.append(fingerprint)
+    return fingerprints
+
+
+def find_duplicates(indexes, min_lines):
+    """Merge file indexes and return the duplicates among files.
+
+    Args:
+        indexes (list): :class:`FileIndex` of each file.
+        min_lines (int): Minimum normalized lines of a duplicate.
+
+    Returns:
+        list: Sorted tuples of both paths, the index of their first
+        normalized lines and the number of lines.
+
+    """
+    occurrences = defaultdict(list)
+    for file_id, index in enumerate(indexes):
+        for fingerprint, position in index.fingerprints:
+            occurrences[fingerprint].append((file_id, position))
+    duplicates = set()
+    for positions in occurrences.values():
+        if len(positions) > _MAX_OCCURRENCES:
+            continue
+        for (file1, line1), (file2, line2) in combinations(positions, 2):
+            if file1 != file2:
+                duplicates.add(_extend(indexes[file1], line1,
+                                       indexes[file2], line2))  # fmt: skip
+    return sorted((index1, line1, index2, line2, length)
+                  for index1, line1, index2, line2, length in duplicates
+                  if length >= min_lines)  # fmt: skip
+
+
+def _extend(index1, line1, index2, line2):
+    """Return the longest match of both files around the given lines."""
+    hashes1, hashes2 = index1.hashes, index2.hashes
+    while line1 and line2 and hashes1[line1 - 1] == hashes2[line2 - 1]:
+        line1, line2 = line1 - 1, line2 - 1
+    length = 0
+    longest = min(len(hashes1) - line1, len(hashes2) - line2)
+    while length < longest and (hashes1[line1 + length]
+                                == hashes2[line2 + length]):  # fmt: skip
+        length += 1
+    if (index1.path, line1) > (index2.path, line2):
+        return index2.path, line2, index1.path, line1, length
+    return index1.path, line1, index2.path, line2, length
+
+
+def _index_file(path_min_lines):
+    """Return the index of a file, or an error message. Run by workers."""
+    path, min_lines = path_min_lines
+    try:
+        return FileIndex(path, min_lines)
+    except (OSError, SyntaxError, UnicodeDecodeError) as error:
+        return f"{path}: could not be read: {error}"
+
+
+def _index_files(paths, min_lines, jobs):
+    """Return file indexes and error messages, indexing in parallel."""
+    args = [(path, min_lines) for path in paths]
+    if jobs > 1 and len(paths) > 1:
+        with Pool(jobs) as pool:
+            results = pool.map(_index_file, args, chunksize=16)
+    else:
+        results = [_index_file(arg) for arg in args]
+    indexes = [result for result in results if isinstance(result, FileIndex)]
+    errors = [result for result in results if isinstance(result, str)]
+    return indexes, errors
+
+
+def _format(line_numbers, duplicate):
+    """Return the output line of a duplicate.
+
+    Args:
+        line_numbers (dict): Line numbers of normalized lines by path.
+        duplicate (tuple): As returned by :func:`find_duplicates`.
+
+    """
+    path1, line1, path2, line2, length = duplicate
+    numbers1 = line_numbers[path1][line1:line1 + length]  # fmt: skip
+    numbers2 = line_numbers[path2][line2:line2 + length]  # fmt: skip
+    return (f"{path1}:{numbers1[0]}: Lines {numbers1[0]}-{numbers1[-1]} are "
+            f"duplicated in {path2}:{numbers2[0]}-{numbers2[-1]} "
+            "[duplicate-code]")  # fmt: skip
+
+
+def main(args=None):
+    """Print the duplicates among the Python files in the given paths."""
+    parser = argparse.ArgumentParser(prog="python -m yala.duplicates")
+    parser.add_argument("paths", nargs="+", help="files and folders")
+    parser.add_argument(
+        "--min-lines",
+        type=int,
+        default=4,
+        help="minimum lines of code of a duplicate",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="processes that index files, 0 for one per CPU",
+    )
+    options = parser.parse_args(args)
+    paths = list(expand_targets(options.paths))
+    jobs = options.jobs or os.cpu_count() or 1
+    indexes, errors = _index_files(paths, options.min_lines, jobs)
+    for error in errors:
+        print(error, file=sys.stderr)
+    line_numbers = {index.path: index.line_numbers for index in indexes}
+    for duplicate in find_duplicates(indexes, options.min_lines):
+        print(_format(line_numbers, duplicate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+"""Run per-file linters in-process, reading and parsing each file once.
+
+Pyflakes, pycodestyle, pydocstyle and radon check one file at a time. As
+separate commands, each of them reads, decodes and parses every file again.
+Here, a :class:`Source` is read once and its text, lines and AST are shared
+by all checkers. Checkers print the same lines as the linters' commands, so
+the linters' parsers produce the same results.
+"""
+# Checkers only need ``check``.
+# pylint: disable=too-few-public-methods
+import argparse
+import ast
+import io
+import tokenize
+from abc import ABCMeta, abstractmethod
+from contextlib import redirect_stderr
+
+
+class Source:
+    """Python source file read once for all checkers."""
+
+    def __init__(self, path):
+        """Read and decode the file as Python does.
+
+        Args:
+            path (str): Path as given to the linters.
+
+        Raises:
+            OSError: The file could not be read.
+            SyntaxError: The encoding declaration is not valid.
+            UnicodeDecodeError: The file does not match its encoding.
+
+        """
+        self.path = path
+        with tokenize.open(path) as file:
+            #: str: Decoded source code.
+            self.text = file.read()
+        self._lines = None
+        self._tree = None
+        #: Exception: Why the source could not be parsed, if so.
+        self.parse_error = None
+
+    @property
+    def lines(self):
+        """Source lines, with line endings."""
+        if self._lines is None:
+            self._lines = self.text.splitlines(keepends=True)
+        return self._lines
+
+    @property
+    def tree(self):
+        """AST of the source or ``None`` (see :attr:`parse_error`)."""
+        if self._tree is None and self.parse_error is None:
+            try:
+                self._tree = ast.parse(self.text)
+            except (SyntaxError, ValueError) as error:
+                self.parse_error = error
+        return self._tree
+
+
+class Checker(metaclass=ABCMeta):
+    """Check sources in-process, printing what a linter's command prints.
+
+    Subclasses map the command-line arguments of a linter. If they can't,
+    the linter must run as a command.
+    """
+
+    #: str: Name of the linter, as in :data:`yala.registry.LINTERS`.
+    name = ""
+
+    def __init__(self, args, files):
+        """Map the linter's arguments to in-process options.
+
+        Args:
+            args (list): Linter's command-line arguments, without targets.
+            files (list): Files that will be checked, as some linters look
+                for configuration files next to them.
+
+        Raises:
+            ValueError: The arguments can't be mapped.
+
+        """
+
+    @abstractmethod
+    def check(self, source, stdout, stderr):
+        """Append to ``stdout`` and ``stderr`` the lines the linter prints.
+
+        Args:
+            source (Source): File to check.
+            stdout (list): Lines printed to stdout.
+            stderr (list): Lines printed to stderr.
+
+        """
+
+
+class Pyflakes(Checker):
+    """Pyflakes on the shared AST."""
+
+    name = "pyflakes"
+
+    def __init__(self, args, files):
+        """Pyflakes has no options that change its results."""
+        super().__init__(args, files)
+        if args:
+            raise ValueError(f"unknown arguments: {args}")
+
+    def check(self, source, stdout, stderr):
+        """Report as pyflakes' command does."""
+        # pylint: disable=import-outside-toplevel
+        from pyflakes.checker import Checker as FlakesChecker
+        from pyflakes.reporter import Reporter
+
+        warnings, errors = io.StringIO(), io.StringIO()
+        reporter = Reporter(warnings, errors)
+        tree = source.tree
+        if tree is None:
+            error = source.parse_error
+            if isinstance(error, SyntaxError):
+                reporter.syntaxError(source.path, error.args[0],
+                                     error.lineno, error.offset,
+                                     error.text)  # fmt: skip
+            else:
+                message = "problem decoding source"
+                reporter.unexpectedError(source.path, message)
+        else:
+            checker = FlakesChecker(tree, filename=source.path)
+            for message in sorted(checker.messages, key=lambda m: m.lineno):
+                reporter.flake(message)
+        stdout += warnings.getvalue().splitlines()
+        stderr += errors.getvalue().splitlines()
+
+
+class Pycodestyle(Checker):
+    """Pycodestyle on the shared lines."""
+
+    name = "pycodestyle"
+
+    #: tuple: Options that change the output format.
+    _OUTPUT_OPTIONS = ("show_source", "show_pep8", "statistics", "count",
+                       "benchmark", "diff")  # fmt: skip
+
+    def __init__(self, args, files):
+        """Parse arguments and config files with pycodestyle itself."""
+        super().__init__(args, files)
+        import pycodestyle  # pylint: disable=import-outside-toplevel
+
+        class Report(pycodestyle.BaseReport):
+            """Keep lines instead of printing them."""
+
+            def __init__(self, options):
+                super().__init__(options)
+                self.results = []
+
+            def error(self, line_number, offset, text, check):
+                code = super().error(line_number, offset, text, check)
+                if code:
+                    row = self.line_offset + line_number
+                    self.results.append(
+                        f"{self.filename}:{row}:{offset + 1}: {text}"
+                    )
+                return code
+
+        # "paths" are parsed as the command line
+        self._style = _call_parser(pycodestyle.StyleGuide,
+                                   paths=[*args, *files],
+                                   reporter=Report)  # fmt: skip
+        options = self._style.options
+        if options.format != "default" or any(
+            getattr(options, option) for option in self._OUTPUT_OPTIONS
+        ):
+            raise ValueError(f"unsupported output options: {args}")
+        self._checker_class = pycodestyle.Checker
+
+    def check(self, source, stdout, stderr):
+        """Report as pycodestyle's command does."""
+        if self._style.excluded(source.path):
+            return
+        report = self._style.options.report
+        report.results = stdout
+        checker = self._checker_class(source.path, lines=source.lines,
+                                      options=self._style.options)  # fmt: skip
+        checker.check_all()
+
+
+class Pydocstyle(Checker):
+    """Pydocstyle on the shared text."""
+
+    name = "pydocstyle"
+
+    def __init__(self, args, files):
+        """Parse arguments and config files with pydocstyle itself."""
+        super().__init__(args, files)
+        # pylint: disable=import-outside-toplevel
+        from pydocstyle.config import ConfigurationParser, IllegalConfiguration
+
+        command_args = [*args, *files]
+
+        class Parser(ConfigurationParser):
+            """Parse our arguments instead of ``sys.argv``."""
+
+            def _parse_args(self, args=None, values=None):
+                if args is None:
+                    args = command_args
+                return super()._parse_args(args, values)
+
+        parser = Parser()
+        try:
+            _call_parser(parser.parse)
+            run_conf = parser.get_user_run_configuration()
+            #: dict: Checked codes and options of each file
+            self._file_configs = {
+                path: options
+                for path, *options in parser.get_files_to_check()
+            }
+        except IllegalConfiguration as error:
+            raise ValueError(f"invalid configuration: {error}") from error
+        if run_conf.explain or run_conf.source or run_conf.count:
+            raise ValueError(f"unsupported output options: {args}")
+
+    def check(self, source, stdout, stderr):
+        """Report as pydocstyle's command does."""
+        # pylint: disable=import-outside-toplevel
+        from pydocstyle.checker import ConventionChecker
+        from pydocstyle.parser import AllError, ParseError
+
+        if source.path not in self._file_configs:
+            return
+        codes, *options = self._file_configs[source.path]
+        try:
+            for error in ConventionChecker().check_source(
+                source.text, source.path, options[0], options[1], False,
+                options[2],
+            ):  # fmt: skip
+                if getattr(error, "code", None) in codes:
+                    stdout += str(error).splitlines()
+        except (AllError, ParseError) as error:
+            stderr.append(f"WARNING: Error in file {source.path}: {error}")
+        except tokenize.TokenError:
+            pass  # not printed by pydocstyle
+
+
+class RadonCC(Checker):
+    """Radon cyclomatic complexity on the shared AST."""
+
+    name = "radon cc"
+
+    def __init__(self, args, files):
+        """Map the options that change radon's results."""
+        super().__init__(args, files)
+        config = _get_radon_config()
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("-n", "--min",
+                            default=config.get_value("cc_min", str, "A"))
+        parser.add_argument("-x", "--max",
+                            default=config.get_value("cc_max", str, "F"))
+        for flag, key in (("-s", "show_complexity"), ("-na", "no_assert"),
+                          ("--show-closures", "show_closures")):
+            default = config.get_value(key, bool, False)
+            parser.add_argument(flag, "--" + key.replace("_", "-"),
+                                dest=key, action="store_true",
+                                default=default)  # fmt: skip
+        self._options = _parse_known(parser, args)
+
+    def check(self, source, stdout, stderr):
+        """Report as radon's command does, without colors."""
+        # pylint: disable=import-outside-toplevel
+        from radon import complexity
+
+        options = self._options
+        tree = source.tree
+        if tree is None:
+            stdout += [source.path, f"    ERROR: {source.parse_error}"]
+            return
+        blocks = complexity.cc_visit_ast(tree, no_assert=options.no_assert)
+        if options.show_closures:
+            blocks = complexity.add_inner_blocks(blocks)
+        lines = []
+        for block in complexity.sorted_results(blocks):
+            rank = complexity.cc_rank(block.complexity)
+            if options.min.upper() <= rank <= options.max.upper():
+                shown = (f" ({block.complexity})"
+                         if options.show_complexity else "")  # fmt: skip
+                lines.append(f"    {block.letter} {block.lineno}:"
+                             f"{block.col_offset} {block.fullname} - "
+                             f"{rank}{shown}")  # fmt: skip
+        if lines:
+            stdout.append(source.path)
+            stdout += lines
+
+
+class RadonMI(Checker):
+    """Radon maintainability index on the shared text and AST."""
+
+    name = "radon mi"
+
+    def __init__(self, args, files):
+        """Map the options that change radon's results."""
+        super().__init__(args, files)
+        config = _get_radon_config()
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("-n", "--min",
+                            default=config.get_value("mi_min", str, "A"))
+        parser.add_argument("-x", "--max",
+                            default=config.get_value("mi_max", str, "C"))
+        parser.add_argument("-m", "--multi", action="store_false",
+                            default=config.get_value("multi", bool, True))
+        parser.add_argument("-s", "--show", action="store_true",
+                            default=config.get_value("show_mi", bool, False))
+        self._options = _parse_known(parser, args)
+
+    def check(self, source, stdout, stderr):
+        """Report as radon's command does, without colors."""
+        # pylint: disable=import-outside-toplevel
+        from radon.metrics import mi_rank
+
+        if source.tree is None:
+            stdout += [source.path, f"    ERROR: {source.parse_error}"]
+            return
+        score = self._get_score(source)
+        rank = mi_rank(score)
+        if self._options.min.upper() <= rank <= self._options.max.upper():
+            shown = f" ({score:.2f})" if self._options.show else ""
+            stdout.append(f"{source.path} - {rank}{shown}")
+
+    def _get_score(self, source):
+        """As radon's ``mi_visit``, without parsing the source again."""
+        # pylint: disable=import-outside-toplevel
+        from radon.metrics import h_visit_ast, mi_compute
+        from radon.raw import analyze
+        from radon.visitors import ComplexityVisitor
+
+        raw = analyze(source.text)
+        comments = raw.comments + (raw.multi if self._options.multi else 0)
+        percent = comments / float(raw.sloc) * 100 if raw.sloc else 0
+        return mi_compute(
+            h_visit_ast(source.tree).total.volume,
+            ComplexityVisitor.from_ast(source.tree).total_complexity,
+            raw.lloc,
+            percent,
+        )
+
+
+#: dict: Checkers indexed by linter name.
+CHECKERS = {cls.name: cls for cls in Checker.__subclasses__()}
+
+
+class Engine:
+    """Run several checkers on each file, reading and parsing it once."""
+
+    def __init__(self, linters, files):
+        """Create a checker for each linter.
+
+        Args:
+            linters (dict): Linter names and their arguments (lists).
+            files (list): Files to check.
+
+        Raises:
+            ValueError: A linter can't run in-process.
+            KeyError: A linter has no checker.
+
+        """
+        self._files = files
+        self._checkers = [CHECKERS[name](args, files)
+                          for name, args in linters.items()]  # fmt: skip
+
+    def check(self):
+        """Check all files.
+
+        Returns:
+            dict: stdout and stderr lines of each linter, indexed by name.
+
+        """
+        outputs = {checker.name: ([], []) for checker in self._checkers}
+        for path in self._files:
+            try:
+                source = Source(path)
+            except (OSError, SyntaxError, UnicodeDecodeError) as error:
+                for _, stderr in outputs.values():
+                    stderr.append(f"{path}: {error}")
+                continue
+            for checker in self._checkers:
+                checker.check(source, *outputs[checker.name])
+        return outputs
+
+
+def _call_parser(function, *args, **kwargs):
+    """Call a function that parses arguments, raising ValueError on errors.
+
+    Usage messages of invalid arguments are not printed.
+    """
+    try:
+        with redirect_stderr(io.StringIO()):
+            return function(*args, **kwargs)
+    except SystemExit as error:
+        raise ValueError("invalid arguments") from error
+
+
+def _parse_known(parser, args):
+    """Parse arguments that are all known by ``parser``."""
+    options, unknown = _call_parser(parser.parse_known_args, args)
+    if unknown:
+        raise ValueError(f"unknown arguments: {unknown}")
+    return options
+
+
+def _get_radon_config():
+    """Read radon's config files as its command does.
+
+    Raises:
+        ValueError: Files are excluded or ignored in the config files.
+
+    """
+    from radon.cli import FileConfig  # pylint: disable=import-outside-toplevel
+
+    config = FileConfig()
+    for key in "exclude", "ignore":
+        if config.get_value(key, str, None):
+            raise ValueError(f'radon "{key}" option is not supported')
+    return config
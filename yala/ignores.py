@@ -0,0 +1,61 @@
+"""Rules ignored in some files, applied to results in the workers."""
+from pathlib import PurePath
+
+from .targets import compile_globs, normalize_path
+
+#: str: Rule that ignores all results of a file.
+ALL_RULES = "*"
+
+
+class PerFileIgnores:
+    """Rules ignored in files matching glob patterns.
+
+    All globs are compiled into a single regex, so most paths are rejected
+    with one match. The rules of each distinct path are found only once.
+    """
+
+    def __init__(self, globs_rules):
+        """Compile the globs.
+
+        Args:
+            globs_rules (list): Pairs of glob pattern (e.g. "tests/*") and
+                rules ignored in matching files. :data:`ALL_RULES` ignores
+                all results.
+
+        """
+        self._globs_rules = [(compile_globs([glob]), frozenset(rules))
+                             for glob, rules in globs_rules]  # fmt: skip
+        self._any = compile_globs([glob for glob, _ in globs_rules])
+        #: dict: Ignored rules of each path found in results.
+        self._path_rules = {}
+
+    def __bool__(self):
+        """Whether any rule is ignored."""
+        return bool(self._globs_rules)
+
+    def get_rules(self, path):
+        """Return the rules ignored in a file."""
+        if path not in self._path_rules:
+            normalized = _normalize(path)
+            rules = frozenset()
+            if self._any.match(normalized):
+                for glob, glob_rules in self._globs_rules:
+                    if glob.match(normalized):
+                        rules |= glob_rules
+            self._path_rules[path] = rules
+        return self._path_rules[path]
+
+    def is_ignored(self, result):
+        """Whether a :class:`base.LinterOutput` is ignored in its file.
+
+        Pylint rules can be given by message id or symbol.
+        """
+        rules = self.get_rules(result.path)
+        return bool(rules) and (
+            ALL_RULES in rules or not rules.isdisjoint(result.rules)
+        )
+
+
+def _normalize(path):
+    """Return a relative path with forward slashes, as in glob patterns."""
+    return PurePath(normalize_path(path)).as_posix()
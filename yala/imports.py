@@ -0,0 +1,134 @@
+"""Module import graph of the linted files.
+
+Cross-module linters (e.g. pylint and mypy) may report different results for
+a module when a module it imports changes. The graph finds the modules that
+must be linted again.
+"""
+import ast
+from collections import defaultdict
+from pathlib import Path
+
+from .cache import read_json_cache, write_json_cache
+
+
+def get_module_name(path):
+    """Return the dotted module name of a file, following package folders.
+
+    Args:
+        path (str): Python file path.
+
+    """
+    path = Path(path)
+    parts = [] if path.stem == "__init__" else [path.stem]
+    folder = path.parent.absolute()
+    while (folder / "__init__.py").is_file():
+        parts.insert(0, folder.name)
+        folder = folder.parent
+    return ".".join(parts)
+
+
+def get_imports(source, module_name, is_package=False):
+    """Return the absolute names of all modules imported by a module.
+
+    Imported names are included because ``from pkg import mod`` may import a
+    module. Parent packages are included because importing a module runs
+    their ``__init__.py``.
+
+    Args:
+        source (bytes): Module source code.
+        module_name (str): Dotted name of the module.
+        is_package (bool): Whether the module is a package's ``__init__.py``.
+
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return set()
+    package = module_name.split(".")
+    if not is_package:
+        package = package[:-1]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            names.update(_get_from_imports(node, package))
+    return {parent for name in names for parent in _with_parents(name)}
+
+
+def _get_from_imports(node, package):
+    """Return candidate module names of a ``from ... import ...``."""
+    if node.level:
+        if node.level > len(package) + 1:
+            return []
+        base = package[:len(package) - node.level + 1]
+        if node.module:
+            base = base + [node.module]
+        module = ".".join(base)
+    else:
+        module = node.module
+    if not module:
+        return [alias.name for alias in node.names]
+    return [module] + [f"{module}.{alias.name}" for alias in node.names]
+
+
+def _with_parents(name):
+    """Yield a module name and its parent packages."""
+    parts = name.split(".")
+    for end in range(1, len(parts) + 1):
+        yield ".".join(parts[:end])
+
+
+class ImportGraph:
+    """Which files import which, cached between runs."""
+
+    # Only ``get_dependents`` is needed.
+    # pylint: disable=too-few-public-methods
+
+    _CACHE_FILE = "imports.json"
+
+    def __init__(self, digests, cache_dir=None):
+        """Build the graph of the given files only.
+
+        Files are parsed only if they changed since the cached graph was built.
+
+        Args:
+            digests (dict): Content digest of each Python file path.
+            cache_dir (str): Folder to cache imports between runs.
+
+        """
+        self._cache_file = (Path(cache_dir, self._CACHE_FILE)
+                            if cache_dir else None)  # fmt: skip
+        cache = read_json_cache(self._cache_file)
+        self._imports = {}  # path -> imported module names
+        for path, digest in digests.items():
+            cached_digest, imports = cache.get(path, (None, None))
+            if cached_digest != digest:
+                imports = self._parse(path)
+            self._imports[path] = (digest, sorted(imports))
+        write_json_cache(self._cache_file, {**cache, **self._imports})
+        self._importers = defaultdict(set)  # module name -> paths
+        for path, (_, imports) in self._imports.items():
+            for module in imports:
+                self._importers[module].add(path)
+
+    @staticmethod
+    def _parse(path):
+        module_name = get_module_name(path)
+        is_package = Path(path).stem == "__init__"
+        return get_imports(Path(path).read_bytes(), module_name, is_package)
+
+    def get_dependents(self, paths):
+        """Return the paths plus all files that import them, transitively.
+
+        Paths may be of removed files, whose importers must be linted again.
+        """
+        found = set(paths)
+        pending = list(paths)
+        while pending:
+            module = get_module_name(pending.pop())
+            for dependent in self._importers[module]:
+                if dependent not in found:
+                    found.add(dependent)
+                    pending.append(dependent)
+        return found
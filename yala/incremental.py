@@ -0,0 +1,167 @@
+"""Lint only what changed since the last run."""
+import hashlib
+import logging
+import os
+
+from .imports import ImportGraph
+from .merkle import MerkleTree
+from .registry import LINTERS
+from .targets import normalize_path
+
+try:
+    from importlib.metadata import PackageNotFoundError, version
+except ImportError:  # Python < 3.8
+    version = None  # type: ignore
+
+LOG = logging.getLogger(__name__)
+
+
+class IncrementalRun:
+    """Choose which files and packages each linter must lint again.
+
+    A linter lints a file again if the file, the linter configuration or the
+    linter version changed since the last time the linter linted it.
+    Cross-module linters also lint again the files that import changed ones,
+    directly or not, and they lint whole top-level packages: a package is
+    given as a folder if any of its files must be linted again. Packages
+    whose hash (of all their files) didn't change are skipped without
+    checking each file. Results of the other files are taken from the store.
+    """
+
+    def __init__(self, store, config, files):
+        """Compute the digests of all files and folders.
+
+        Args:
+            store (ResultStore): Results and digests of previous runs.
+            config (Config): Yala configuration.
+            files (list): Python files to be linted.
+
+        """
+        self._store = store
+        self._config = config
+        self._tree = MerkleTree(files, config.cache_dir)
+        self._digests = self._tree.digests
+        #: dict: Files of each top-level package.
+        self._packages = self._tree.get_packages()
+        self._linter_configs = {}
+        self._graph = None
+
+    def get_digest(self, linter_name, path):
+        """Return the digest of a file or package for a linter.
+
+        The digest includes the linter configuration and version, and the
+        rules ignored by all linters and per file.
+        """
+        if linter_name not in self._linter_configs:
+            # Ignored rules are passed to linters or filtered out of results
+            linter_config = self._config.get_linter_config(linter_name)
+            self._linter_configs[linter_name] = (
+                sorted(linter_config.items()),
+                sorted(self._config.ignored_rules),
+                self._config.per_file_ignores,
+                _get_version(LINTERS.get(linter_name)),
+            )
+        content = self._digests.get(path) or self._tree.folders[path]
+        key = f"{content} {self._linter_configs[linter_name]}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get_targets(self, linter_classes):
+        """Return the files and packages that each linter must lint again.
+
+        Returns:
+            dict: Linter name as key and file list as value.
+
+        """
+        return {linter.name: self._get_linter_targets(linter)
+                for linter in linter_classes}  # fmt: skip
+
+    def _get_linter_targets(self, linter_class):
+        name = linter_class.name
+        linted = self._store.get_digests(name)
+        unchanged = [
+            package
+            for package in self._packages
+            if linted.get(package) == self.get_digest(name, package)
+        ]
+        skipped = {path for package in unchanged
+                   for path in self._packages[package]}  # fmt: skip
+        changed = [
+            path
+            for path in self._digests
+            if path not in skipped
+            and linted.get(path) != self.get_digest(name, path)
+        ]
+        if linter_class.cross_file or linter_class.cross_module:
+            # Files importing removed modules may have new errors
+            removed = [path for path in linted
+                       if path not in self._digests
+                       and not os.path.exists(path)]  # fmt: skip
+            if (changed or removed) and linter_class.cross_file:
+                changed = sorted(self._digests)
+            elif changed or removed:
+                graph = self._get_graph()
+                dependents = graph.get_dependents(changed + removed)
+                changed = sorted(dependents.intersection(self._digests))
+        LOG.info("%s: %d changed file(s), %d of %d package(s) unchanged",
+                 name, len(changed), len(unchanged),
+                 len(self._packages))  # fmt: skip
+        if linter_class.cross_module:
+            return self._group_by_package(changed)
+        return changed
+
+    def _group_by_package(self, paths):
+        """Replace files in packages by their top-level package folders."""
+        file_packages = {path: package
+                         for package, files in self._packages.items()
+                         for path in files}  # fmt: skip
+        packages = {file_packages[path] for path in paths
+                    if path in file_packages}  # fmt: skip
+        return sorted(packages) + [path for path in paths
+                                   if path not in file_packages]  # fmt: skip
+
+    def _get_graph(self):
+        if self._graph is None:
+            self._graph = ImportGraph(self._digests, self._config.cache_dir)
+        return self._graph
+
+    def get_linted(self, linter_targets):
+        """Return ``(linter, path, digest)`` of each linted file and package.
+
+        A package is linted if all of its files are.
+
+        Args:
+            linter_targets (dict): Files and package folders linted by each
+                finished linter.
+
+        """
+        for linter, paths in linter_targets.items():
+            files = set()
+            for path in paths:
+                files.update(self._packages.get(path, (path,)))
+            for path in files:
+                yield linter, path, self.get_digest(linter, path)
+            for package, package_files in self._packages.items():
+                if files.issuperset(package_files):
+                    yield linter, package, self.get_digest(linter, package)
+
+    def get_results(self, linters):
+        """Return the latest results of the files and linters.
+
+        Args:
+            linters (iterable): Linter names.
+
+        """
+        linters = set(linters)
+        return [result for result in self._store.get_current_results()
+                if result.linter_name in linters
+                and normalize_path(result.path) in self._digests]  # fmt: skip
+
+
+def _get_version(linter_class):
+    """Return the installed version of a linter or "" if unknown."""
+    if linter_class is None or version is None:
+        return ""
+    try:
+        return version(linter_class.distribution or linter_class.name)
+    except PackageNotFoundError:
+        return ""
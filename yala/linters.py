@@ -1,27 +1,66 @@
 """Module for linters."""
+
 # The less we need to code, the better!
+import logging
 import re
-
-from .base import Linter, LinterOutput
+import shlex
+import subprocess
+import sys
+import warnings
+from pathlib import Path
+
+from .base import LazyPattern, Linter, LinterOutput
+from .registry import LINTERS as _LINTERS
+
+LOG = logging.getLogger(__name__)
+
+#: frozenset: Mypy error codes, to tell them apart from pylint symbols.
+_MYPY_ERROR_CODES = frozenset("""
+    abstract annotation-unchecked arg-type assignment attr-defined
+    await-not-async call-arg call-overload comparison-overlap deprecated
+    dict-item empty-body exit-return explicit-override func-returns-value
+    has-type ignore-without-code import import-not-found import-untyped index
+    list-item method-assign misc mutable-override name-defined
+    name-match narrowed-type-not-subtype no-any-return no-any-unimported
+    no-overload-impl no-redef no-untyped-call no-untyped-def operator
+    overload-overlap override possibly-undefined prop-decorator
+    redundant-cast redundant-expr redundant-self return return-value
+    safe-super str-bytes-safe str-format syntax top-level-await truthy-bool
+    truthy-function truthy-iterable type-abstract type-arg type-var
+    typeddict-item typeddict-readonly-mutated typeddict-unknown-key
+    unimported-reveal union-attr unreachable unused-awaitable unused-coroutine
+    unused-ignore used-before-def valid-newtype valid-type var-annotated
+""".split())
+
+
+def _is_true(value):
+    """Whether a config value means "true"."""
+    return value.strip().lower() in ("1", "yes", "true", "on")
 
 
 class Flake8(Linter):
     """Parser for flake8."""
 
     name = "flake8"
+    rule_pattern = LazyPattern(r"[A-Z]+\d+")
+    ignore_option = "--extend-ignore={}"
+
+    pattern = LazyPattern(
+        r"""
+            ^(?P<path>.+?)
+            :(?P<line_nr>\d+?)
+            :(?P<col>\d+?)
+            :\ (?P<msg>.+)$
+        """,
+        re.VERBOSE,
+    )
 
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
-        pattern = re.compile(
-            r"""
-                ^(?P<path>.+?)
-                :(?P<line_nr>\d+?)
-                :(?P<col>\d+?)
-                :\ (?P<msg>.+)$
-            """,
-            re.VERBOSE,
+        return (
+            self._parse_by_pattern(stdout_lines, self.pattern),
+            stderr_lines,
         )
-        return self._parse_by_pattern(stdout_lines, pattern), stderr_lines
 
 
 class Isort(Linter):
@@ -29,18 +68,23 @@ class Isort(Linter):
 
     name = "isort"
 
+    # E.g. "ERROR: /my/path/main.py Imports are incorrectly sorted."
+    pattern = LazyPattern(
+        r"""
+            ^.+?
+            :\ (?P<full_path>.+\.py)
+            \ (?P<msg>.+)$
+        """,
+        re.VERBOSE,
+    )
+    results_in_stderr = True
+
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
-        # E.g. "ERROR: /my/path/main.py Imports are incorrectly sorted."
-        pattern = re.compile(
-            r"""
-                ^.+?
-                :\ (?P<full_path>.+\.py)
-                \ (?P<msg>.+)$
-            """,
-            re.VERBOSE,
+        return (
+            self._parse_by_pattern(stderr_lines, self.pattern),
+            stdout_lines,
         )
-        return self._parse_by_pattern(stderr_lines, pattern), stdout_lines
 
     def _create_output_from_match(self, match_result):
         """As isort outputs full path, we change it to relative path."""
@@ -52,44 +96,107 @@ class Isort(Linter):
 class Pycodestyle(Linter):
     """Pycodestyle parser."""
 
+    # Ignored rules are not passed to pycodestyle, because "--ignore" would
+    # replace the project's ignore list. They are filtered out of results.
     name = "pycodestyle"
 
+    pattern = LazyPattern(
+        r"""
+            ^(?P<path>.+?)
+            :(?P<line_nr>\d+?)
+            :(?P<col>\d+?)
+            :\ (?P<msg>.+)$
+        """,
+        re.VERBOSE,
+    )
+
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
-        pattern = re.compile(
-            r"""
-                ^(?P<path>.+?)
-                :(?P<line_nr>\d+?)
-                :(?P<col>\d+?)
-                :\ (?P<msg>.+)$
-            """,
-            re.VERBOSE,
+        return (
+            self._parse_by_pattern(stdout_lines, self.pattern),
+            stderr_lines,
         )
-        return self._parse_by_pattern(stdout_lines, pattern), stderr_lines
 
 
 class Mypy(Linter):
     """Mypy parser."""
 
     name = "mypy"
+    cross_module = True
+    _STATUS_FILE = "dmypy.json"
+    ignore_option = "--disable-error-code={}"
+
+    pattern = LazyPattern(
+        r"""
+            ^(?P<path>.+?)
+            :(?P<line_nr>\d+?)
+            :\ (?P<msg>.+)$
+        """,
+        re.VERBOSE,
+    )
+
+    @property
+    def command(self):
+        """Use a cache per configuration and, optionally, the mypy daemon.
+
+        A managed cache is not used if the arguments set another one. With
+        "mypy daemon = true", dmypy starts in the first run and the next ones
+        reuse it for warm incremental checks.
+        """
+        if not self.cache_dir:
+            return self.name
+        cache_dir = self._get_cache_dir()
+        options = ""
+        own_cache = "--cache-dir" in self.config.get("args", "")
+        if self.manage_cache and not own_cache:
+            options = " --cache-dir " + shlex.quote(cache_dir)
+        if self._is_daemon():
+            status_file = shlex.quote(str(Path(cache_dir, self._STATUS_FILE)))
+            return f"dmypy --status-file {status_file} run --{options}"
+        return self.name + options
+
+    def prepare(self):
+        """Create the folder of the daemon's status file."""
+        if self.cache_dir and self._is_daemon():
+            Path(self._get_cache_dir()).mkdir(parents=True, exist_ok=True)
+
+    def _is_daemon(self):
+        return _is_true(self.config.get("daemon", ""))
+
+    def get_ignore_options(self):
+        """Mypy requires one option per error code."""
+        rules = self._get_own_ignored_rules()
+        return " ".join(self.ignore_option.format(rule) for rule in rules)
+
+    def owns_rule(self, rule):
+        """Whether the rule is a mypy error code."""
+        return rule in _MYPY_ERROR_CODES
+
+    @classmethod
+    def stop_daemons(cls, cache_dir):
+        """Stop all mypy daemons started with caches in ``cache_dir``."""
+        status_files = Path(cache_dir, cls.name).glob("*/" + cls._STATUS_FILE)
+        for status_file in status_files:
+            command = ["dmypy", "--status-file", str(status_file), "stop"]
+            process = subprocess.run(  # nosec
+                command, capture_output=True, text=True, check=False
+            )
+            LOG.info("%s: %s", status_file, process.stdout.strip())
 
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
-        pattern = re.compile(
-            r"""
-                ^(?P<path>.+?)
-                :(?P<line_nr>\d+?)
-                :\ (?P<msg>.+)$
-            """,
-            re.VERBOSE,
+        return (
+            self._parse_by_pattern(stdout_lines, self.pattern),
+            stderr_lines,
         )
-        return self._parse_by_pattern(stdout_lines, pattern), stderr_lines
 
 
 class Pydocstyle(Linter):
     """Pydocstyle parser."""
 
     name = "pydocstyle"
+    rule_pattern = LazyPattern(r"D\d+")
+    ignore_option = "--add-ignore={}"
 
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
@@ -116,43 +223,70 @@ class Pyflakes(Linter):
 
     name = "pyflakes"
 
+    pattern = LazyPattern(
+        r"""
+            ^(?P<path>.+?)
+            :(?P<line_nr>\d+?)
+            :(?P<col>\d+?)?
+            :\ (?P<msg>.+)$
+        """,
+        re.VERBOSE,
+    )
+
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
-        pattern = re.compile(
-            r"""
-                ^(?P<path>.+?)
-                :(?P<line_nr>\d+?)
-                :(?P<col>\d+?)?
-                :\ (?P<msg>.+)$
-            """,
-            re.VERBOSE,
+        return (
+            self._parse_by_pattern(stdout_lines, self.pattern),
+            stderr_lines,
         )
-        return self._parse_by_pattern(stdout_lines, pattern), stderr_lines
 
 
 class Pylint(Linter):
     """Pylint parser."""
 
     name = "pylint"
+    cross_module = True
+    # Message ids (e.g. "C0114") and symbols (e.g. "missing-module-docstring")
+    rule_pattern = LazyPattern(r"[CRWEIF]\d{4}|[a-z]+(?:-[a-z0-9]+)*")
+    ignore_option = "--disable={}"
+
+    pattern = LazyPattern(
+        r"""
+            .*?^(?P<path>[^\n]+?)
+            :(?P<msg>.+)
+            :(?P<line_nr>\d+?)
+            :(?P<col>\d+?)$
+        """,
+        re.X | re.M | re.S,
+    )
+    # Matching many lines at once, the message must not span results.
+    buffer_pattern = LazyPattern(
+        r"""
+            ^(?P<path>[^\n]+?)
+            :(?P<msg>.+?)
+            :(?P<line_nr>\d+)
+            :(?P<col>\d+)$
+        """,
+        re.X | re.M | re.S,
+    )
 
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
-        pattern = re.compile(
-            r"""
-                .*?^(?P<path>[^\n]+?)
-                :(?P<msg>.+)
-                :(?P<line_nr>\d+?)
-                :(?P<col>\d+?)$
-            """,
-            re.X | re.M | re.S,
+        return (
+            self._parse_by_pattern(stdout_lines, self.pattern),
+            stderr_lines,
         )
-        return self._parse_by_pattern(stdout_lines, pattern), stderr_lines
+
+    def owns_rule(self, rule):
+        """Do not take mypy error codes for pylint symbols."""
+        return rule not in _MYPY_ERROR_CODES and super().owns_rule(rule)
 
 
 class RadonCC(Linter):
     """Parser for radon ciclomatic complexity."""
 
     name = "radon cc"
+    distribution = "radon"
 
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
@@ -186,44 +320,98 @@ class RadonMI(Linter):
     """Parser for radon maintainability index."""
 
     name = "radon mi"
+    distribution = "radon"
+
+    pattern = LazyPattern(
+        r"""
+            ^(?P<path>.+)
+            \ -\ (?P<msg>[A-F])$
+        """,
+        re.VERBOSE,
+    )
 
     def parse(self, stdout_lines, stderr_lines):
         """Parse linter stdout and stderr lines."""
-        pattern = re.compile(
-            r"""
-                ^(?P<path>.+)
-                \ -\ (?P<msg>[A-F])$
-            """,
-            re.VERBOSE,
+        return (
+            self._parse_by_pattern(stdout_lines, self.pattern),
+            stderr_lines,
         )
-        return self._parse_by_pattern(stdout_lines, pattern), stderr_lines
 
 
 class Black(Linter):
-    """Parser for black code formatter lint check."""
+    """Parser for black code formatter lint check.
+
+    Expected error message:
+
+    would reformat file1.py
+    would reformat file2.py
+    Oh no! 💥 💔 💥
+    2 files would be reformatted.
+    """
 
     name = "black"
     command = "black --check"
 
+    pattern = LazyPattern(
+        r"""
+            ^.*?(?P<msg>would\sreformat)\s
+            (?P<path>.+\.py)$
+        """,
+        re.VERBOSE,
+    )
+    results_in_stderr = True
+
+    @property
+    def env(self):
+        """Use a cache per configuration, if caches are managed."""
+        if not (self.cache_dir and self.manage_cache):
+            return {}
+        return {"BLACK_CACHE_DIR": self._get_cache_dir()}
+
     def parse(self, stdout_lines, stderr_lines):
-        """Parse linter stdout and stderr lines.
+        """Parse linter stdout and stderr lines."""
+        return (
+            self._parse_by_pattern(stderr_lines, self.pattern),
+            stdout_lines,
+        )
 
-        Expected error message:
 
-        would reformat file1.py
-        would reformat file2.py
-        Oh no! 💥 💔 💥
-        2 files would be reformatted.
-        """
-        pattern = re.compile(
-            r"""
-                ^.*?(?P<msg>would\sreformat)\s
-                (?P<path>.+\.py)$
-            """,
-            re.VERBOSE,
+class Duplicates(Linter):
+    """Parser for yala's duplicate code detector (:mod:`yala.duplicates`).
+
+    It replaces pylint's duplicate-code check, disabled in the default
+    configuration.
+    """
+
+    name = "duplicates"
+    distribution = "yala"
+    command = f"{shlex.quote(sys.executable)} -m yala.duplicates"
+    cross_file = True
+
+    pattern = LazyPattern(
+        r"""
+            ^(?P<path>.+?)
+            :(?P<line_nr>\d+)
+            :\ (?P<msg>.+)$
+        """,
+        re.VERBOSE,
+    )
+
+    def parse(self, stdout_lines, stderr_lines):
+        """Parse linter stdout and stderr lines."""
+        return (
+            self._parse_by_pattern(stdout_lines, self.pattern),
+            stderr_lines,
         )
-        return self._parse_by_pattern(stderr_lines, pattern), stdout_lines
 
 
-#: dict: All Linter subclasses indexed by class name
-LINTERS = {cls.name: cls for cls in Linter.__subclasses__()}
+def __getattr__(name):
+    """Return ``LINTERS``, moved to :mod:`yala.registry`, with a warning."""
+    if name == "LINTERS":
+        warnings.warn(
+            "yala.linters.LINTERS is deprecated, use yala.registry.LINTERS",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return _LINTERS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
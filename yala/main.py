@@ -1,62 +1,205 @@
 """Run linters on files and directories and sort results.
 
 Usage:
-  yala <path>...
+  yala [--fail-fast | --max-issues=<n>] [--all-tiers | --speculative]
+       [--store=<db> [--new] [--incremental] | --summary [--top=<n>] |
+        --staged-snapshot] <path>...
+  yala --store=<db> --report=<query>
+  yala --metrics [--cc-min=<rank>] [--mi-min=<rank>] [--dropped] <path>...
+  yala --stop-daemons
   yala --dump-config
   yala --version
   yala -h | --help
 
 Options:
+  --fail-fast  Stop linting as soon as any issue is found.
+  --max-issues=<n>  Stop linting after finding at least <n> issues.
+  --all-tiers  Run all tiers even if a previous one found issues.
+  --speculative  Start all tiers at once, but discard the results of the
+                 next tiers if a previous one found issues.
+  --store=<db>  Keep the results of every run in a SQLite database.
+  --new  Show only the issues that the previous run didn't find.
+  --incremental  Lint only the files that changed since the last run (and,
+                 for pylint and mypy, the files that import them).
+  --summary  Show issue counts by linter, rule and file instead of issues.
+  --top=<n>  Number of rules and files in the summary [default: 10].
+  --staged-snapshot  Lint the staged version of the staged Python files
+                     (e.g. in a pre-commit hook), without touching the
+                     working tree.
+  --report=<query>  Show stored results instead of linting. Queries: all
+                    (latest results), new (since the previous run), files
+                    (issue count per file), and rules (count per rule).
+  --metrics  Show radon results from raw metrics cached per file. Only
+             changed files are measured again.
+  --cc-min=<rank>  Minimum cyclomatic complexity rank (A-F) of --metrics.
+                   Default: D, or A with --dropped.
+  --mi-min=<rank>  Minimum maintainability index rank (A-C) of --metrics.
+                   Default: D (none), or A with --dropped.
+  --dropped  Show only blocks and files whose rank got worse when their file
+             last changed.
+  --stop-daemons  Stop linter daemons started by yala (dmypy).
   --dump-config  Show all detected configurations
   --version  Show yala and linters' versions.
   -h --help  Show this help.
 
 """
+# Modules that only some commands need are imported where they are used, so
+# yala starts quickly.
+# pylint: disable=import-outside-toplevel
 import logging
+import os
 import shlex
+import signal
 import subprocess
 import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
 from itertools import chain
-from multiprocessing import Pool
-from typing import List
+from typing import List, NamedTuple, Set
 
-from docopt import docopt
-
-from . import __version__
+from . import __version__, configure_logging
+from .base import LinterOutput
 from .config import Config
-from .linters import LINTERS
+from .ignores import PerFileIgnores
+from .memory import (Admission, MemoryStats, get_job_peak, start_job,
+                     wait_process)
+from .registry import LINTERS
+from .summary import Summary
+from .targets import TargetFilter, expand_targets
 
 LOG = logging.getLogger(__name__)
 
+#: set: Linter subprocesses running in this (worker) process.
+_PROCESSES: Set[subprocess.Popen] = set()
+
+#: int: In-process jobs per CPU, so that workers finish at about the same time.
+_CHUNKS_PER_CPU = 4
+
 
 class LinterRunner:
     """Run linter and process results."""
 
-    config = None
-    targets: List[str] = []
+    def __init__(self, linter_class, config, targets):
+        """Create the linter with its configuration.
+
+        Nothing is shared by runners, so they can run concurrently.
 
-    def __init__(self, linter_class):
-        """Set linter class and its configuration."""
-        linter_class.config = self.config.get_linter_config(linter_class.name)
+        Args:
+            linter_class (type): :class:`Linter` subclass.
+            config (Config): Yala configuration.
+            targets (list): Files and folders to lint.
+
+        """
+        self.config = config
+        self.targets = targets
         self._linter = linter_class()
+        self._linter.config = config.get_linter_config(linter_class.name)
+        self._linter.cache_dir = config.cache_dir
+        self._linter.manage_cache = config.manage_caches
+        self._linter.ignored_rules = config.ignored_rules
+        self._per_file_ignores = PerFileIgnores(config.per_file_ignores)
 
     @classmethod
     def run(cls, linter_cfg_tgts):
-        """Run a linter and return the results."""
-        linter_class, cls.config, cls.targets = linter_cfg_tgts
-        runner = cls(linter_class)
-        return runner.get_results()
+        """Run a linter and return its name and results.
+
+        Args:
+            linter_cfg_tgts (tuple): Linter class, config, targets and whether
+                to return a :class:`Summary` instead of a result list.
+
+        """
+        linter_class, config, targets, summarize = linter_cfg_tgts
+        runner = cls(linter_class, config, targets)
+        return (runner.linter_name, *runner.get_results(summarize))
+
+    @classmethod
+    def run_in_process(cls, linters_cfg_files):
+        """Run linters with :class:`Engine` and return their names and results.
+
+        If the engine can't run a linter for these files, all of them run as
+        commands.
+
+        Args:
+            linters_cfg_files (tuple): Linter classes, config, files and
+                whether to return a :class:`Summary` instead of a result list.
 
-    def get_results(self):
+        """
+        linter_classes, config, files, summarize = linters_cfg_files
+        runners = [cls(linter_class, config, files)
+                   for linter_class in linter_classes]  # fmt: skip
+        names = tuple(runner.linter_name for runner in runners)
+        from .engine import Engine
+
+        try:
+            engine = Engine(
+                {runner.linter_name: runner.get_args() for runner in runners},
+                files,
+            )
+        except (ValueError, ImportError) as error:
+            LOG.info("Running %s as commands: %s", ", ".join(names), error)
+            return (names, *cls._run_commands(runners, summarize))
+        outputs = engine.check()
+        LOG.info("Finished %s (%d files)", ", ".join(names), len(files))
+        return (names, *cls._parse_outputs(runners, outputs, summarize))
+
+    @staticmethod
+    def _parse_outputs(runners, outputs, summarize):
+        """Parse and merge the outputs of in-process linters."""
+        stdouts, stderrs = [], []
+        for runner in runners:
+            results, errors = runner.parse(*outputs[runner.linter_name])
+            stdouts.append(results)
+            stderrs += errors
+        collect = Summary().update if summarize else list
+        return collect(chain.from_iterable(stdouts)), stderrs
+
+    @staticmethod
+    def _run_commands(runners, summarize):
+        """Run linters as commands and merge their results."""
+        stdouts, stderrs = [], []
+        for runner in runners:
+            stdout, stderr = runner.get_results(summarize)
+            stdouts.append(stdout)
+            stderrs += stderr
+        if summarize:
+            summary = Summary()
+            for linter_summary in stdouts:
+                summary.merge(linter_summary)
+            return summary, stderrs
+        return list(chain.from_iterable(stdouts)), stderrs
+
+    @property
+    def linter_name(self):
+        """Name of the linter being run."""
+        return self._linter.name
+
+    @staticmethod
+    def init_worker():
+        """Kill linter subprocesses when the pool terminates this worker.
+
+        Threads can't handle signals, so nothing is done in thread pools.
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, _kill_processes)
+
+    def get_results(self, summarize=False):
         """Run the linter, parse, and return result list.
 
         If a linter specified by the user is not found, return an error message
         as result.
+
+        Args:
+            summarize (bool): Return a :class:`Summary` instead of a list,
+                counting results as they are parsed.
+
         """
+        # Can't return a generator from a subprocess
+        collect = Summary().update if summarize else list
         try:
-            stdout, stderr = self._lint()
-            # Can't return a generator from a subprocess
-            return list(stdout), self._format_stderr(stderr)
+            stdout, stderr = self._lint(collect)
+            return stdout, self._format_stderr(stderr)
         except FileNotFoundError as exception:
             # Error if the linter was not found but was chosen by the user
             if self._linter.name in self.config.user_linters:
@@ -64,9 +207,24 @@ class LinterRunner:
                     f"Could not find {self._linter.name}. "
                     f"Did you install it? Got exception: {exception}"
                 )
-                return [], [error_msg]
+                return collect([]), [error_msg]
             # If the linter was not chosen by the user, do nothing
-            return [], []
+            return collect([]), []
+
+    def parse(self, stdout_lines, stderr_lines):
+        """Parse the output of the linter as :meth:`get_results` does.
+
+        Returns:
+            tuple: Results without ignored rules and stderr lines.
+
+        """
+        results, errors = self._linter.parse(stdout_lines, stderr_lines)
+        return self._filter_ignored(results), self._format_stderr(errors)
+
+    def get_args(self):
+        """Linter arguments from config, without the command and targets."""
+        command = shlex.split(self._linter.command)
+        return shlex.split(self._linter.command_with_options)[len(command):]
 
     def _get_command(self):
         """Return command with options and targets, ready for execution."""
@@ -75,66 +233,191 @@ class LinterRunner:
         cmd_shlex = shlex.split(cmd_str)
         return list(cmd_shlex)
 
-    def _lint(self):
-        """Run linter in a subprocess."""
-        command = self._get_command()
-        process = subprocess.run(  # nosec
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=False,
-        )
-        LOG.info("Finished %s", self._linter.name)
-        stdout, stderr = self._get_output_lines(process)
-        return self._linter.parse(stdout, stderr)
+    def _lint(self, collect):
+        """Run linter in a subprocess and parse its output.
 
-    @staticmethod
-    def _get_output_lines(process):
-        return [
-            (line for line in output.decode("utf-8").splitlines() if line)
-            for output in (process.stdout, process.stderr)
-        ]
+        Outputs are written to temporary files that are memory-mapped for
+        parsing, so they are never copied as a whole into Python objects.
+
+        Args:
+            collect (function): Receive parsed results (a generator) and
+                return an object that can be sent to the main process.
+
+        """
+        from tempfile import TemporaryFile
+
+        command = self._get_command()
+        env = self._linter.env
+        self._linter.prepare()
+        with TemporaryFile() as stdout_file, TemporaryFile() as stderr_file:
+            with subprocess.Popen(  # nosec
+                command,
+                stdout=stdout_file,
+                stderr=stderr_file,
+                env={**os.environ, **env} if env else None,
+            ) as process:
+                _PROCESSES.add(process)
+                try:
+                    wait_process(process)
+                finally:
+                    _PROCESSES.discard(process)
+            LOG.info("Finished %s", self._linter.name)
+            with _map_file(stdout_file) as stdout, _map_file(
+                stderr_file
+            ) as stderr:
+                results, errors = self._linter.parse_buffers(stdout, stderr)
+                results = self._filter_ignored(results)
+                # Parse everything before the buffers are unmapped
+                return collect(results), list(errors)
+
+    def _filter_ignored(self, results):
+        """Drop ignored rules that the linter could not disable by itself.
+
+        Rules ignored per file are also dropped. Filtering here, in the
+        workers and before counting, keeps ignored results from being sent
+        to the main process and summaries accurate.
+        """
+        ignored = set(self._linter.ignored_rules)
+        per_file = self._per_file_ignores
+        if not (ignored or per_file):
+            return results
+        return (result for result in results
+                if result.rule not in ignored
+                and not (per_file and per_file.is_ignored(result)))
 
     def _format_stderr(self, lines):
         return [f"[{self._linter.name}] {line}" for line in lines]
 
 
+class LintReport(NamedTuple):
+    """Results of a run, as returned by :meth:`Main.get_report`."""
+
+    #: list: Sorted :class:`LinterOutput` objects.
+    results: List[LinterOutput]
+    #: list: Lines linters printed to stderr, prefixed by their names.
+    errors: List[str]
+    #: list: Names of the linters that finished (were not cancelled).
+    finished_linters: List[str]
+
+
 class Main:
-    """Parse all linters and aggregate results."""
+    """Parse all linters and aggregate results.
 
-    # We only need the ``run`` method.
+    A :class:`Main` object can lint many times, also concurrently (e.g. in
+    threads or with :meth:`get_report_async`). Runs share only the
+    configuration and, if given, the pool.
+    """
 
-    def __init__(self, config=None, all_linters=None):
-        """Initialize the only Config object and assign it to other classes.
+    def __init__(self, config=None, all_linters=None, pool=None):
+        """Initialize the only Config object.
 
         Args:
             config (Config): Config object.
             all_linters (dict): Names and classes of all available linters.
+            pool (multiprocessing.pool.Pool): Long-lived pool for all runs,
+                e.g. ``Pool(initializer=LinterRunner.init_worker)`` shared by
+                the :class:`Main` objects of a service. By default, each run
+                starts its own pool. Cancelled linters are not terminated in
+                a shared pool, only their results are discarded.
 
         """
         self._classes = all_linters or LINTERS
         self._config = config or Config(self._classes)
-        LinterRunner.config = self._config
+        self._pool = pool
+
+    def lint(self, targets, max_issues=None, all_tiers=False,
+             speculative=False, linter_targets=None):  # fmt: skip
+        """Run tiers in sequence, linters of a tier in parallel, and sort.
 
-    def lint(self, targets):
-        """Run linters in parallel and sort all results.
+        By default, a tier only runs if the previous ones found no issues.
 
         Args:
             targets (list): List of files and folders to lint.
+            max_issues (int): Cancel the remaining linters as soon as this
+                number of issues is found. ``None`` waits for all of them.
+            all_tiers (bool): Run all tiers regardless of previous results.
+            speculative (bool): Run the next tiers in the background while
+                waiting for the current one.
+            linter_targets (dict): Targets of specific linters by name, used
+                instead of ``targets``. Linters without targets are skipped.
 
         """
-        LinterRunner.targets = targets
-        linters = self._config.get_linter_classes()
-        with Pool() as pool:
-            linter_cfg_tgts = (
-                (linter, self._config, targets)
-                for linter in linters
-            )  # fmt: skip
-            linters_out_err = pool.map(LinterRunner.run, linter_cfg_tgts)
-        stdouts, stderrs = zip(*linters_out_err)
+        stdouts, stderrs, _ = self._run(
+            targets,
+            False,
+            max_issues=max_issues,
+            all_tiers=all_tiers,
+            speculative=speculative,
+            linter_targets=linter_targets,
+        )
         return (sorted(chain.from_iterable(stdouts)),
                 chain.from_iterable(stderrs))  # fmt: skip
 
+    def get_report(self, targets, **options):
+        """Run linters as :meth:`lint` does and return a :class:`LintReport`.
+
+        Args:
+            targets (list): List of files and folders to lint.
+            options: Other :meth:`lint` arguments.
+
+        """
+        stdouts, stderrs, finished = self._run(targets, False, **options)
+        return LintReport(sorted(chain.from_iterable(stdouts)),
+                          list(chain.from_iterable(stderrs)),
+                          finished)  # fmt: skip
+
+    async def get_report_async(self, targets, **options):
+        """Await :meth:`get_report`, run in the event loop's executor."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        report = partial(self.get_report, targets, **options)
+        return await loop.run_in_executor(None, report)
+
+    def summarize(self, targets, **options):
+        """Run linters as :meth:`lint` does, but only count the results.
+
+        Results are counted by the workers while they are parsed, so they
+        are never kept nor sent to the main process.
+
+        Args:
+            targets (list): List of files and folders to lint.
+            options: Other :meth:`lint` arguments.
+
+        Returns:
+            Summary: Issue counts.
+            iterable of str: Lines to print to stderr.
+
+        """
+        stdouts, stderrs, _ = self._run(targets, True, **options)
+        summary = Summary()
+        for linter_summary in stdouts:
+            summary.merge(linter_summary)
+        return summary, chain.from_iterable(stderrs)
+
+    def _run(self, targets, summarize, *, max_issues=None, all_tiers=False,
+             speculative=False, linter_targets=None):  # fmt: skip
+        """Run tiers and return linters' stdouts, stderrs and finished ones."""
+        # Arguments of lint plus summarize
+        # pylint: disable=too-many-arguments
+        options = {
+            "max_issues": max_issues,
+            "all_tiers": all_tiers,
+            "speculative": speculative,
+            "linter_targets": linter_targets or {},
+        }
+        if self._pool:
+            run = _LintRun(self._config, self._pool, summarize)
+            stdouts, stderrs = run.collect(targets, **options)
+        else:
+            from multiprocessing import Pool
+
+            # Leaving the context terminates the workers of cancelled linters
+            with Pool(initializer=LinterRunner.init_worker) as pool:
+                run = _LintRun(self._config, pool, summarize)
+                stdouts, stderrs = run.collect(targets, **options)
+        return stdouts, stderrs, run.finished_linters
+
     def run_from_cli(self, args):
         """Read arguments, run and print results.
 
@@ -144,9 +427,113 @@ class Main:
         """
         if args["--dump-config"]:
             self._config.print_config()
+        elif args["--stop-daemons"]:
+            from .linters import Mypy
+
+            Mypy.stop_daemons(self._config.cache_dir)
+        elif args["--report"]:
+            self.print_report(args["--store"], args["--report"])
+        elif args["--metrics"]:
+            self.print_metrics(
+                args["<path>"],
+                args["--cc-min"],
+                args["--mi-min"],
+                args["--dropped"],
+            )
         else:
-            stdout, stderr = self.lint(args["<path>"])
-            self.print_results(stdout, stderr)
+            self._lint_from_cli(args)
+
+    def _lint_from_cli(self, args):
+        options = {
+            "max_issues": self._get_max_issues(args),
+            "all_tiers": args["--all-tiers"],
+            "speculative": args["--speculative"],
+        }
+        if args["--summary"]:
+            top = _get_positive_int(args, "--top")
+            summary, stderr = self.summarize(args["<path>"], **options)
+            self.print_summary(summary, stderr, top)
+            return
+        if args["--staged-snapshot"]:
+            stdout, stderr = self._lint_snapshot(args["<path>"], **options)
+        elif args["--store"]:
+            stdout, stderr = self._lint_and_store(
+                args["<path>"],
+                args["--store"],
+                args["--incremental"],
+                args["--new"],
+                **options,
+            )
+        else:
+            stdout, stderr = self.lint(args["<path>"], **options)
+        self.print_results(stdout, stderr)
+
+    def _lint_snapshot(self, targets, **options):
+        """Lint staged files in a snapshot of the git index.
+
+        Linters get the paths of the staged files in the snapshot and run in
+        the current folder, so the process folder is never changed.
+        """
+        from .snapshot import StagedSnapshot
+
+        try:
+            snapshot = StagedSnapshot()
+        except (subprocess.CalledProcessError, FileNotFoundError) as error:
+            sys.exit(f"Could not read the git index: {error}")
+        with snapshot:
+            targets = snapshot.get_targets(targets)
+            if not targets:
+                return [], []
+            stdout, stderr = self.lint(targets, **options)
+            stderr = list(stderr)
+        for result in stdout:
+            result.path = snapshot.get_original_path(result.path)
+        return stdout, [snapshot.map_path(line) for line in stderr]
+
+    def _lint_and_store(self, targets, db_path, incremental, only_new,
+                        **options):  # fmt: skip
+        """Lint, save the run and return its results or only the new ones.
+
+        In incremental runs, the results of the files that were not linted
+        again are taken from the database.
+        """
+        # Two of them are the classes imported here
+        # pylint: disable=too-many-locals
+        from .incremental import IncrementalRun
+        from .store import ResultStore
+
+        files = list(expand_targets(targets))
+        with ResultStore(db_path) as store:
+            run = IncrementalRun(store, self._config, files)
+            linter_targets = None
+            if incremental:
+                linter_targets = run.get_targets(
+                    self._config.get_linter_classes()
+                )
+            report = self.get_report(
+                targets, linter_targets=linter_targets, **options
+            )
+            linted = {linter: linter_targets[linter] if incremental else files
+                      for linter in report.finished_linters}  # fmt: skip
+            stdout = report.results
+            run_id = store.add_run(run.get_linted(linted), stdout)
+            if only_new:
+                stdout = store.get_new_results(run_id)
+            elif incremental:
+                up_to_date = [linter
+                              for linter, paths in linter_targets.items()
+                              if not paths]  # fmt: skip
+                stdout = run.get_results(report.finished_linters + up_to_date)
+        return sorted(stdout), report.errors
+
+    @staticmethod
+    def _get_max_issues(args):
+        """Return the issue threshold from CLI arguments or ``None``."""
+        if args["--fail-fast"]:
+            return 1
+        if args["--max-issues"]:
+            return _get_positive_int(args, "--max-issues")
+        return None
 
     @classmethod
     def print_results(cls, stdout, stderr):
@@ -160,6 +547,70 @@ class Main:
         else:
             print(":) No issues found.")
 
+    @staticmethod
+    def print_summary(summary, stderr, top):
+        """Print issue counts and exit with an error if there's any issue."""
+        for line in stderr:
+            print(line, file=sys.stderr)
+        if summary:
+            summary.print(top)
+            issue = "issues" if len(summary) > 1 else "issue"
+            sys.exit(f":( {len(summary)} {issue} found.")
+        print(":) No issues found.")
+
+    @classmethod
+    def print_report(cls, db_path, query):
+        """Print the answer to a query about stored results."""
+        from .store import ResultStore
+
+        with ResultStore(db_path) as store:
+            if query in ("all", "new"):
+                results = (store.get_current_results() if query == "all"
+                           else store.get_new_results())  # fmt: skip
+                cls.print_results(sorted(results), [])
+            elif query == "files":
+                for path, total in store.count_by_file():
+                    print(f"{total:>8} {path}")
+            elif query == "rules":
+                for linter, rule, total in store.count_by_rule():
+                    print(f"{total:>8} {rule or '-'} [{linter}]")
+            else:
+                sys.exit(f"Unknown report: {query}.")
+
+    def print_metrics(self, targets, cc_min=None, mi_min=None, dropped=False):
+        """Print radon results from cached metrics, measuring changed files.
+
+        Args:
+            targets (list): Files and folders.
+            cc_min (str): Minimum cyclomatic complexity rank.
+            mi_min (str): Minimum maintainability index rank.
+            dropped (bool): Only ranks that got worse.
+
+        """
+        default = "A" if dropped else "D"
+        cc_min = (cc_min or default).upper()
+        mi_min = (mi_min or default).upper()
+        if cc_min not in ("A", "B", "C", "D", "E", "F"):
+            sys.exit("The --cc-min rank must be a letter from A to F.")
+        # Radon ranks files from A to C; D shows none of them
+        if mi_min not in ("A", "B", "C", "D"):
+            sys.exit("The --mi-min rank must be a letter from A to C, or D.")
+        from .merkle import get_file_digest
+        from .metrics import RadonMetrics
+
+        target_filter = TargetFilter.from_config(self._config)
+        digests = {
+            path: get_file_digest(path)
+            for path in expand_targets(targets, target_filter)
+        }
+        target_filter.log()
+        try:
+            metrics = RadonMetrics(digests, self._config.cache_dir)
+        except FileNotFoundError:
+            sys.exit("Did you install radon?")
+        results = metrics.get_results(cc_min, mi_min, dropped)
+        self.print_results(sorted(results), [])
+
     @staticmethod
     def _print_stdout(stdout):
         for line in stdout:
@@ -168,7 +619,239 @@ class Main:
         sys.exit(f"\n:( {len(stdout)} {issue} found.")
 
 
+class _LintRun:
+    """State of a single run: its pool jobs and finished linters."""
+
+    # Only ``collect`` is needed.
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, config, pool, summarize):
+        """Prepare a run that submits jobs to ``pool``.
+
+        Args:
+            config (Config): Yala configuration.
+            pool (multiprocessing.pool.Pool): Pool that runs linters.
+            summarize (bool): Whether jobs return :class:`Summary` objects
+                instead of result lists.
+
+        """
+        self._config = config
+        self._pool = pool
+        self._summarize = summarize
+        #: list: Names of the linters whose jobs are all finished.
+        self.finished_linters = []
+        #: Counter: Number of unfinished jobs of each linter.
+        self._pending = Counter()
+
+    def collect(self, targets, *, max_issues, all_tiers, speculative,
+                linter_targets):  # fmt: skip
+        """Run tiers and return lists of linters' stdouts and stderrs."""
+        # Same arguments as Main.lint
+        # pylint: disable=too-many-arguments
+        targets, linter_targets = self._filter_targets(targets, linter_targets)
+        budget = self._config.max_memory
+        # Peaks are only kept between runs to schedule for a memory budget
+        stats = MemoryStats(self._config.cache_dir if budget else None)
+        admission = Admission(self._pool, stats, budget)
+        tiers = self._start_tiers(admission, targets, speculative,
+                                  linter_targets)  # fmt: skip
+        stdouts_stderrs = self._collect_tiers(tiers, max_issues, all_tiers)
+        stats.save()
+        return stdouts_stderrs
+
+    def _filter_targets(self, targets, linter_targets):
+        """Skip oversized, generated and vendored files, if configured.
+
+        If files are skipped, linters get the remaining files instead of
+        folders, including the package folders of incremental runs.
+        Otherwise, targets are not changed.
+        """
+        target_filter = TargetFilter.from_config(self._config)
+        if not target_filter:
+            return targets, linter_targets
+        files = list(expand_targets(targets, target_filter))
+        if target_filter.skipped:
+            targets = files
+        linter_targets = {
+            linter: list(expand_targets(paths, target_filter))
+            for linter, paths in linter_targets.items()
+        }
+        target_filter.log()
+        return targets, linter_targets
+
+    def _collect_tiers(self, tiers, max_issues, all_tiers):
+        """Gather results tier by tier until one of them says to stop."""
+        stdouts, stderrs = [], []
+        for linters_out_err in tiers:
+            found = sum(len(stdout) for stdout in stdouts)
+            remaining = max_issues - found if max_issues else None
+            names, tier_stdouts, tier_stderrs = self._collect(
+                linters_out_err, remaining
+            )
+            self._set_finished(names)
+            stdouts += tier_stdouts
+            stderrs += tier_stderrs
+            if self._should_stop(tier_stdouts, all_tiers, remaining):
+                if len(self._config.tiers) > 1:
+                    LOG.info("Found issues, skipping the next tiers.")
+                break
+        return stdouts, stderrs
+
+    def _start_tiers(self, admission, targets, speculative, linter_targets):
+        """Return an iterable of tier results. Submit tiers lazily if needed.
+
+        Tier tasks are queued in order, so speculative tiers only use the
+        workers that previous tiers leave idle. With a memory budget, they
+        start when the previous tiers finish.
+        """
+        tiers = (
+            admission.imap_unordered(
+                _run_job, self._get_jobs(tier, targets, linter_targets)
+            )
+            for tier in self._config.get_linter_tiers()
+        )
+        return list(tiers) if speculative else tiers
+
+    def _get_jobs(self, tier, targets, linter_targets):
+        """Return a command job per linter and in-process jobs per files.
+
+        Linters that run in-process and have the same targets share jobs, so
+        each file is read and parsed once. Each job comes with a key for
+        memory stats: the linter names.
+        """
+        from .engine import CHECKERS
+
+        jobs, in_process = [], {}
+        for linter in tier:
+            tgts = linter_targets.get(linter.name, targets)
+            if not tgts:
+                continue
+            if self._config.in_process and linter.name in CHECKERS:
+                in_process.setdefault(tuple(tgts), []).append(linter)
+            else:
+                jobs.append(self._get_command_job(linter, tgts))
+        for tgts, linters in in_process.items():
+            files = list(expand_targets(tgts))
+            linters = self._check_in_process(linters, tgts, files, jobs)
+            key = "+".join(linter.name for linter in linters)
+            for chunk in _split(files) if linters else []:
+                jobs.append((key, (LinterRunner.run_in_process,
+                                   (linters, self._config, chunk,
+                                    self._summarize))))  # fmt: skip
+                self._pending.update(linter.name for linter in linters)
+        return jobs
+
+    def _get_command_job(self, linter, targets):
+        """Return a job that runs the linter as a command."""
+        self._pending[linter.name] += 1
+        return (linter.name, (LinterRunner.run,
+                              (linter, self._config, targets,
+                               self._summarize)))  # fmt: skip
+
+    def _check_in_process(self, linters, targets, files, jobs):
+        """Return the linters that can run in-process. Add jobs for others."""
+        from .engine import CHECKERS
+
+        in_process = []
+        for linter in linters:
+            args = LinterRunner(linter, self._config, targets).get_args()
+            try:
+                CHECKERS[linter.name](args, files)
+                in_process.append(linter)
+            except (ValueError, ImportError) as error:
+                LOG.info("Running %s as a command: %s", linter.name, error)
+                jobs.append(self._get_command_job(linter, targets))
+        return in_process
+
+    def _set_finished(self, names):
+        """Add linters whose jobs are all finished to the finished ones.
+
+        Args:
+            names (list): Names of a linter (str) or many (tuple) per job.
+
+        """
+        for job_names in names:
+            if isinstance(job_names, str):
+                job_names = (job_names,)
+            for name in job_names:
+                self._pending[name] -= 1
+                if not self._pending[name]:
+                    self.finished_linters.append(name)
+
+    @staticmethod
+    def _should_stop(tier_stdouts, all_tiers, max_issues):
+        """Whether the next tiers should not run (or their results used)."""
+        issues = sum(len(stdout) for stdout in tier_stdouts)
+        if max_issues and issues >= max_issues:
+            return True
+        return bool(issues) and not all_tiers
+
+    @staticmethod
+    def _collect(linters_out_err, max_issues):
+        """Gather linter results until ``max_issues`` is reached, if set."""
+        names, stdouts, stderrs = [], [], []
+        for name, stdout, stderr in linters_out_err:
+            names.append(name)
+            stdouts.append(stdout)
+            stderrs.append(stderr)
+            issues = sum(len(lines) for lines in stdouts)
+            if max_issues and issues >= max_issues:
+                LOG.info("Found %d issue(s), cancelling linters.", issues)
+                break
+        return names, stdouts, stderrs
+
+
+def _get_positive_int(args, option):
+    """Return the value of a CLI option or exit if it's not a positive int."""
+    value = args[option]
+    if not value.isdigit() or not int(value):
+        sys.exit(f"{option} must be a positive integer, got {value!r}.")
+    return int(value)
+
+
+def _run_job(job):
+    """Call a job's function with its arguments, in a pool worker.
+
+    Returns:
+        tuple: The function's result followed by the job's peak memory.
+
+    """
+    function, args = job
+    start_job()
+    return (*function(args), get_job_peak())
+
+
+def _split(files):
+    """Split files into chunks to be checked in parallel."""
+    size = -(-len(files) // ((os.cpu_count() or 1) * _CHUNKS_PER_CPU))
+    if not size:
+        return []
+    return [files[i:i + size] for i in range(0, len(files), size)]
+
+
+@contextmanager
+def _map_file(file):
+    """Memory-map a whole file for reading. Empty files can't be mapped."""
+    import mmap
+
+    if not os.fstat(file.fileno()).st_size:
+        yield b""
+        return
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        yield buffer
+
+
+def _kill_processes(signum, _frame):
+    """Kill running linters and exit. Used as a signal handler."""
+    for process in list(_PROCESSES):
+        process.kill()
+    sys.exit(128 + signum)
+
+
 def main():
     """Entry point for the console script."""
+    from docopt import docopt
+
+    configure_logging()
     args = docopt(__doc__, version=__version__)
     Main().run_from_cli(args)
@@ -0,0 +1,235 @@
+"""Peak memory of linter jobs, to start only the jobs that fit a budget.
+
+Linters such as pylint and mypy may use many gigabytes on large trees. The
+peak resident set size (RSS) of each job is measured and cached, so the next
+runs start a job only when its projected memory fits the "max memory" budget.
+"""
+import logging
+import os
+import queue
+import re
+import subprocess  # nosec
+import sys
+import threading
+from pathlib import Path
+
+from .cache import read_json_cache, write_json_cache
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+LOG = logging.getLogger(__name__)
+
+#: threading.local: Peak memory of the job running in this thread.
+_JOB = threading.local()
+
+#: float: Seconds between reads of the peak memory of a linter process.
+_POLL_INTERVAL = 0.05
+
+#: re.Pattern: Peak resident set size in a ``/proc/<pid>/status`` file.
+_PEAK_PATTERN = re.compile(r"^VmHWM:\s+(\d+) kB$", re.MULTILINE)
+
+
+def start_job():
+    """Forget the peak memory of the previous job of this thread."""
+    _JOB.peak = None
+
+
+def wait_process(process):
+    """Wait for a linter subprocess and record its peak memory.
+
+    On Linux, the high-water mark of the process ("VmHWM" in
+    ``/proc/<pid>/status``) is read while it runs, so only the linter's own
+    memory is counted. Memory allocated during the last poll interval before
+    the process exits is not counted. Elsewhere, ``ru_maxrss`` is used, which
+    may include the memory the process inherited when it was forked, i.e. the
+    size of this worker.
+
+    Args:
+        process (subprocess.Popen): Running linter.
+
+    """
+    status = Path(f"/proc/{process.pid}/status")
+    if status.exists():
+        peak = _poll_peak(process, status)
+    elif hasattr(os, "wait4"):
+        _, exit_status, rusage = os.wait4(process.pid, 0)
+        process.returncode = (-os.WTERMSIG(exit_status)
+                              if os.WIFSIGNALED(exit_status)
+                              else os.WEXITSTATUS(exit_status))  # fmt: skip
+        peak = _to_kib(rusage.ru_maxrss)
+    else:
+        process.wait()
+        return
+    _JOB.peak = max(getattr(_JOB, "peak", None) or 0, peak)
+
+
+def _poll_peak(process, status):
+    """Wait for a process and return its highest "VmHWM" in KiB."""
+    peak = 0
+    while True:
+        peak = max(peak, _read_peak(status))
+        try:
+            process.wait(_POLL_INTERVAL)
+            return peak
+        except subprocess.TimeoutExpired:
+            pass
+
+
+def _read_peak(status):
+    """Return "VmHWM" of a process status file, or 0 if it has exited."""
+    try:
+        match = _PEAK_PATTERN.search(status.read_text())
+    except OSError:
+        return 0
+    return int(match.group(1)) if match else 0
+
+
+def get_job_peak():
+    """Return the peak memory of the current job in KiB.
+
+    Jobs that ran subprocesses report the largest one. Otherwise, it's the
+    peak of this (worker) process, where the job ran. ``0`` if unknown.
+    """
+    peak = getattr(_JOB, "peak", None)
+    if peak is None and resource:
+        peak = _to_kib(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    return peak or 0
+
+
+def _to_kib(max_rss):
+    """Convert ``ru_maxrss`` to KiB. It's in bytes on macOS."""
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+class MemoryStats:
+    """Highest peak memory of each job kind, cached between runs.
+
+    The highest peak is kept instead of the latest one, because incremental
+    runs lint fewer files and would underestimate a full run.
+    """
+
+    _CACHE_FILE = "memory.json"
+
+    def __init__(self, cache_dir=None):
+        """Read the peaks of previous runs.
+
+        Args:
+            cache_dir (str): Folder to cache peaks between runs.
+
+        """
+        self._cache_file = (Path(cache_dir, self._CACHE_FILE)
+                            if cache_dir else None)  # fmt: skip
+        #: dict: Peak memory in KiB by job key, e.g. "pylint".
+        self.peaks = read_json_cache(self._cache_file)
+
+    def update(self, key, peak):
+        """Keep the peak memory of a job if it's the highest so far."""
+        if peak > self.peaks.get(key, 0):
+            self.peaks[key] = peak
+
+    def save(self):
+        """Write the peaks to the cache folder."""
+        write_json_cache(self._cache_file, self.peaks)
+
+
+class Admission:
+    """Submit jobs to a pool only while their projected memory fits a budget.
+
+    The projected memory of a job is the highest peak of previous jobs with
+    the same key. Jobs that never ran are assumed to use an even share of the
+    budget among the CPUs.
+    """
+
+    # Only ``imap_unordered`` is needed.
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, pool, stats, budget=None):
+        """Schedule jobs of a pool.
+
+        Args:
+            pool (multiprocessing.pool.Pool): Pool that runs the jobs.
+            stats (MemoryStats): Peaks of previous runs, updated with the
+                peaks of finished jobs.
+            budget (int): Memory budget in KiB. ``None`` starts all jobs at
+                once, as ``Pool.imap_unordered`` does.
+
+        """
+        self._pool = pool
+        self._stats = stats
+        self._budget = budget
+        self._unknown = budget // (os.cpu_count() or 1) if budget else 0
+
+    def imap_unordered(self, function, keyed_jobs):
+        """Return an iterator of job results in the order they finish.
+
+        Without a budget, all jobs are submitted now, as
+        ``Pool.imap_unordered`` does. Otherwise, they are submitted while the
+        results are consumed.
+
+        Args:
+            function (function): Run a job in the pool and return a tuple
+                ending with the job's peak memory in KiB, which is recorded
+                but not included in the results.
+            keyed_jobs (iterable): Pairs of job key (e.g. linter name) and
+                job (``function`` argument).
+
+        """
+        calls = [(function, key, job) for key, job in keyed_jobs]
+        if self._budget:
+            finished = self._admit_all(calls)
+        else:
+            finished = self._pool.imap_unordered(_call, calls)
+        return self._record(finished)
+
+    def _record(self, finished):
+        """Update memory stats with finished jobs and yield their results."""
+        for key, result in finished:
+            self._stats.update(key, result[-1])
+            yield result[:-1]
+
+    def _admit_all(self, calls):
+        """Submit jobs as memory is released and yield their keys and results.
+
+        Jobs are submitted in order, but a job that doesn't fit may be
+        overtaken by smaller ones. A job larger than the budget runs alone.
+        """
+        estimates = {key: self._estimate(key) for _, key, _ in calls}
+        finished = queue.SimpleQueue()
+        running, in_use = 0, 0
+        while calls or running:
+            waiting = []
+            for call in calls:
+                estimate = estimates[call[1]]
+                if running and in_use + estimate > self._budget:
+                    waiting.append(call)
+                    continue
+                self._pool.apply_async(
+                    _call,
+                    (call,),
+                    callback=finished.put,
+                    error_callback=finished.put,
+                )
+                running += 1
+                in_use += estimate
+            calls = waiting
+            if calls:
+                LOG.debug("Waiting for memory to start %d job(s)", len(calls))
+            key_result = finished.get()
+            if isinstance(key_result, BaseException):
+                raise key_result
+            running -= 1
+            in_use -= estimates[key_result[0]]
+            yield key_result
+
+    def _estimate(self, key):
+        """Return the projected memory of a job in KiB."""
+        return self._stats.peaks.get(key, self._unknown)
+
+
+def _call(function_key_job):
+    """Run a job in a pool worker and return its key and result."""
+    function, key, job = function_key_job
+    return key, function(job)
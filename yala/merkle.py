@@ -0,0 +1,96 @@
+"""Content hashes of files and folders (a Merkle tree), cached between runs.
+
+A folder's hash covers the names and hashes of its entries, so it changes
+only if a file below it changes, is added or is removed. Comparing the hash
+of a package tells whether any of its files changed.
+"""
+import hashlib
+import os
+from collections import defaultdict
+from pathlib import Path, PurePath
+
+from .cache import read_json_cache, write_json_cache
+
+
+def get_file_digest(path):
+    """Return the SHA-256 hex digest of a file's content."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class MerkleTree:
+    """Hashes of files and of the folders that contain them.
+
+    File hashes are cached with the file size and modification time, so
+    unchanged files are not read again.
+    """
+
+    # Only the attributes and ``get_packages`` are needed.
+    # pylint: disable=too-few-public-methods
+
+    _CACHE_FILE = "merkle.json"
+
+    def __init__(self, files, cache_dir=None):
+        """Hash the files and their folders.
+
+        Args:
+            files (list): Paths of the files.
+            cache_dir (str): Folder to cache the tree between runs.
+
+        """
+        self._cache_file = (Path(cache_dir, self._CACHE_FILE)
+                            if cache_dir else None)  # fmt: skip
+        cached = read_json_cache(self._cache_file).get("files", {})
+        stats = {}
+        #: dict: Digest of each file.
+        self.digests = {}
+        for path in files:
+            stat = os.stat(path)
+            stats[path] = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(path)
+            if entry and entry[:2] == stats[path]:
+                self.digests[path] = entry[2]
+            else:
+                self.digests[path] = get_file_digest(path)
+        #: dict: Digest of each folder with files, including their parents.
+        self.folders = _hash_folders(self.digests)
+        files = {path: [*stats[path], digest]
+                 for path, digest in self.digests.items()}  # fmt: skip
+        cache = {"files": files, "folders": self.folders}
+        write_json_cache(self._cache_file, cache)
+
+    def get_packages(self):
+        """Return the top-level packages and the files of each one.
+
+        Packages are folders with an ``__init__.py`` file whose parent is
+        not a package.
+        """
+        inits = {str(PurePath(path).parent) for path in self.digests
+                 if PurePath(path).name == "__init__.py"}  # fmt: skip
+        packages = defaultdict(list)
+        for path in self.digests:
+            package = None
+            for parent in PurePath(path).parents:
+                if str(parent) not in inits:
+                    break
+                package = str(parent)
+            if package:
+                packages[package].append(path)
+        return dict(packages)
+
+
+def _hash_folders(digests):
+    """Return the digest of each folder, hashing the deepest ones first."""
+    digests = {str(PurePath(path)): digest for path, digest in digests.items()}
+    entries = defaultdict(dict)
+    for path in digests:
+        pure = PurePath(path)
+        for child, parent in zip([pure, *pure.parents], pure.parents):
+            entries[str(parent)][child.name] = str(child)
+    folders = {}
+    for folder in sorted(entries, key=lambda f: -len(PurePath(f).parts)):
+        content = hashlib.sha256()
+        for name, child in sorted(entries[folder].items()):
+            digest = digests.get(child) or folders[child]
+            content.update(f"{name}\0{digest}\n".encode())
+        folders[folder] = content.hexdigest()
+    return folders
@@ -0,0 +1,223 @@
+"""Raw radon metrics, cached per file to apply thresholds without radon.
+
+Radon linters only output the blocks and files above the configured ranks.
+Here, radon runs with the lowest thresholds and the numeric complexities and
+maintainability indexes are cached, so any threshold can be applied later
+and files can be compared with their previous versions.
+"""
+import json
+import logging
+import subprocess  # nosec
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from multiprocessing.pool import ThreadPool
+from pathlib import Path
+
+from .base import LinterOutput
+from .cache import read_json_cache, write_json_cache
+
+LOG = logging.getLogger(__name__)
+
+#: tuple: Highest cyclomatic complexity of ranks A to E. Higher ones are F.
+_CC_BOUNDS = (5, 10, 20, 30, 40)
+_CC_RANKS = "ABCDEF"
+#: tuple: Highest maintainability index of ranks C and B. Higher ones are A.
+_MI_BOUNDS = (9, 19)
+_MI_RANKS = "CBA"
+
+#: int: Files per radon command.
+_CHUNK_SIZE = 200
+
+
+def get_cc_rank(complexity):
+    """Return radon's rank of a cyclomatic complexity, from A to F."""
+    return _CC_RANKS[bisect_left(_CC_BOUNDS, complexity)]
+
+
+def get_mi_rank(index):
+    """Return radon's rank of a maintainability index, from A to C."""
+    return _MI_RANKS[bisect_left(_MI_BOUNDS, index)]
+
+
+class RadonMetrics:
+    """Cyclomatic complexity and maintainability index of files.
+
+    Radon runs only on the files that changed since they were cached. When a
+    file changes, the metrics of its cached version are kept as the previous
+    ones, to find out which blocks and files dropped a rank.
+    """
+
+    # Only ``get_results`` is needed.
+    # pylint: disable=too-few-public-methods
+
+    _CACHE_FILE = "radon.json"
+
+    def __init__(self, digests, cache_dir=None):
+        """Read cached metrics and measure the files that changed.
+
+        Args:
+            digests (dict): Content digest of each Python file path.
+            cache_dir (str): Folder to cache metrics between runs.
+
+        Raises:
+            FileNotFoundError: Radon is not installed.
+
+        """
+        self._cache_file = (Path(cache_dir, self._CACHE_FILE)
+                            if cache_dir else None)  # fmt: skip
+        cache = read_json_cache(self._cache_file)
+        changed = [path for path, digest in digests.items()
+                   if cache.get(path, (None,))[0] != digest]  # fmt: skip
+        LOG.info("radon metrics: %d changed file(s)", len(changed))
+        measured = _measure(changed)
+        #: dict: Digest, maintainability index, blocks and previous metrics
+        #: of each file.
+        self.files = {}
+        for path, digest in digests.items():
+            if path in measured:
+                old = cache.get(path)
+                previous = _get_summary(old[1:3]) if old else None
+                self.files[path] = [digest, *measured[path], previous]
+            else:
+                self.files[path] = cache[path]
+        write_json_cache(self._cache_file, {**cache, **self.files})
+        self._index()
+
+    def _index(self):
+        """Keep all metrics in arrays to filter them at once."""
+        # Path and previous rank ("" if unknown) of each file
+        self._paths = [(path, get_mi_rank(previous[0]) if previous else "")
+                       for path, (_, _, _, previous) in self.files.items()]
+        self._mi = array("d", (metrics[1] for metrics in self.files.values()))
+        # Path, line, column, letter, name and previous rank of each block
+        self._blocks = []
+        self._cc = array("l")
+        for path, (_, _, blocks, previous) in self.files.items():
+            old_complexities = previous[1] if previous else {}
+            for *block, complexity in blocks:
+                old = old_complexities.get(block[3])
+                old_rank = get_cc_rank(old) if old else ""
+                self._blocks.append((path, *block, old_rank))
+                self._cc.append(complexity)
+
+    def get_results(self, cc_min="D", mi_min="D", dropped=False):
+        """Return the results of radon linters with these minimum ranks.
+
+        Args:
+            cc_min (str): Minimum cyclomatic complexity rank, from A to F.
+            mi_min (str): Minimum maintainability index rank, from A to C.
+                Ranks after C (e.g. the default D) show no files, as radon
+                does.
+            dropped (bool): Only blocks and files whose rank is worse than
+                before their file last changed. Blocks are compared by name.
+                New files and blocks are not included.
+
+        Returns:
+            list: :class:`base.LinterOutput` of both radon linters.
+
+        """
+        cc_bound = _get_cc_bound(cc_min)
+        mi_bound = _get_mi_bound(mi_min)
+        blocks = compress(zip(self._blocks, self._cc),
+                          (value > cc_bound for value in self._cc))
+        paths = compress(zip(self._paths, self._mi),
+                         (value <= mi_bound for value in self._mi))
+        if dropped:
+            blocks = ((block, value) for block, value in blocks
+                      if block[-1] and get_cc_rank(value) > block[-1])
+            paths = ((path, value) for path, value in paths
+                     if path[-1] and get_mi_rank(value) > path[-1])
+        return ([self._get_cc_output(*block, dropped) for block in blocks]
+                + [self._get_mi_output(*path, dropped) for path in paths])
+
+    @staticmethod
+    def _get_cc_output(block, complexity, dropped):
+        path, line, col, _, name, old_rank = block
+        msg = f"{name} - {get_cc_rank(complexity)} ({complexity})"
+        if dropped:
+            msg += f", was {old_rank}"
+        return LinterOutput("radon cc", path, msg, line, col)
+
+    @staticmethod
+    def _get_mi_output(path_rank, index, dropped):
+        path, old_rank = path_rank
+        msg = f"{get_mi_rank(index)} ({index:.2f})"
+        if dropped:
+            msg += f", was {old_rank}"
+        return LinterOutput("radon mi", path, msg)
+
+
+def _get_cc_bound(rank):
+    """Return the highest complexity below a rank."""
+    index = _CC_RANKS.index(rank.upper())
+    return _CC_BOUNDS[index - 1] if index else 0
+
+
+def _get_mi_bound(rank):
+    """Return the highest maintainability index of a rank or worse."""
+    rank = rank.upper()
+    if rank not in _MI_RANKS:
+        return -1
+    index = _MI_RANKS.index(rank)
+    return _MI_BOUNDS[index] if index < len(_MI_BOUNDS) else float("inf")
+
+
+def _get_summary(mi_blocks):
+    """Return the maintainability index and complexity by block name."""
+    index, blocks = mi_blocks
+    return [index, {block[3]: block[4] for block in blocks}]
+
+
+def _measure(paths):
+    """Return the maintainability index and blocks of each file.
+
+    Blocks are lists of line, column, letter (as in radon's output), name and
+    complexity. Chunks of files are measured in parallel.
+    """
+    chunks = [paths[start:start + _CHUNK_SIZE]
+              for start in range(0, len(paths), _CHUNK_SIZE)]  # fmt: skip
+    measured = {}
+    if chunks:
+        with ThreadPool() as pool:
+            for chunk_metrics in pool.imap_unordered(_measure_chunk, chunks):
+                measured.update(chunk_metrics)
+    return measured
+
+
+def _measure_chunk(paths):
+    """Run radon cc and mi with the lowest thresholds on a few files."""
+    complexities = _run_radon("cc", "--min", "A", "--max", "F", *paths)
+    indexes = _run_radon("mi", "--min", "A", "--max", "C", *paths)
+    measured = {}
+    for path in paths:
+        index = indexes.get(path, {}).get("mi")
+        # Files without functions nor classes are not in cc's output
+        blocks = complexities.get(path, [])
+        if index is None or not isinstance(blocks, list):
+            LOG.warning("radon could not measure %s", path)
+            index, blocks = float("inf"), []
+        measured[path] = [index, [_get_block(block) for block in blocks]]
+    return measured
+
+
+def _get_block(block):
+    """Return line, column, letter, name and complexity of a JSON block."""
+    name = block["name"]
+    if "classname" in block:
+        name = f"{block['classname']}.{name}"
+    return [block["lineno"], block["col_offset"], block["type"][0].upper(),
+            name, block["complexity"]]  # fmt: skip
+
+
+def _run_radon(command, *args):
+    """Return the JSON output of a radon command."""
+    stdout = subprocess.run(  # nosec
+        ["radon", command, "--json", *args],
+        stdout=subprocess.PIPE,
+        check=False,
+    ).stdout
+    try:
+        return json.loads(stdout)
+    except ValueError:
+        return {}
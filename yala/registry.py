@@ -0,0 +1,65 @@
+"""Names of the available linters, resolved to their classes when used.
+
+Commands that don't lint (e.g. ``--version`` and ``--report``) and runs with
+a few linters should not import every linter. The registry maps names to
+"module:class" paths and imports a class when it's first looked up.
+"""
+from collections.abc import Mapping
+from importlib import import_module
+
+
+class LinterRegistry(Mapping):
+    """Linter classes by name, imported on first lookup.
+
+    Iterating and testing membership only use names, so the configuration
+    can choose linters without importing them.
+    """
+
+    def __init__(self, paths):
+        """Map linter names to their classes.
+
+        Args:
+            paths (dict): Linter names and "module:class" paths, e.g.
+                ``{"mypy": "yala.linters:Mypy"}``.
+
+        """
+        self._paths = dict(paths)
+        self._classes = {}
+
+    def __getitem__(self, name):
+        """Import and return the class of a linter."""
+        if name not in self._classes:
+            module, _, class_name = self._paths[name].partition(":")
+            self._classes[name] = getattr(import_module(module), class_name)
+        return self._classes[name]
+
+    def __contains__(self, name):
+        """Whether there's a linter with this name, without importing it."""
+        return name in self._paths
+
+    def __iter__(self):
+        """Iterate over linter names."""
+        return iter(self._paths)
+
+    def __len__(self):
+        """Return the number of linters."""
+        return len(self._paths)
+
+
+#: dict: Module and class of each linter.
+_LINTER_PATHS = {
+    "flake8": "yala.linters:Flake8",
+    "isort": "yala.linters:Isort",
+    "pycodestyle": "yala.linters:Pycodestyle",
+    "mypy": "yala.linters:Mypy",
+    "pydocstyle": "yala.linters:Pydocstyle",
+    "pyflakes": "yala.linters:Pyflakes",
+    "pylint": "yala.linters:Pylint",
+    "radon cc": "yala.linters:RadonCC",
+    "radon mi": "yala.linters:RadonMI",
+    "black": "yala.linters:Black",
+    "duplicates": "yala.linters:Duplicates",
+}
+
+#: LinterRegistry: All linters indexed by name.
+LINTERS = LinterRegistry(_LINTER_PATHS)
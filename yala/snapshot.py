@@ -0,0 +1,162 @@
+"""Staged version of a git repository, to lint it without the worktree."""
+import os
+import posixpath
+import shutil
+import subprocess  # nosec
+import tempfile
+from pathlib import Path
+
+#: str: Preferred parent folder of snapshots, in memory on Linux.
+_SHM_DIR = "/dev/shm"  # nosec
+
+
+class StagedSnapshot:
+    """Staged version of a git repository in a temporary folder.
+
+    Files that differ between the index and the working tree are written from
+    the index by a single ``git cat-file --batch`` process. Other files and
+    folders are symlinks to the working tree, so imports of unchanged modules
+    still resolve and creating a snapshot costs about as much as the changes.
+
+    Use it as a context manager. The folder is removed on exit.
+    """
+
+    def __init__(self):
+        """Find the repository of the current folder.
+
+        Raises:
+            subprocess.CalledProcessError: Not in a git repository.
+
+        """
+        #: str: Root folder of the repository.
+        self.root = os.path.realpath(self._git("rev-parse", "--show-toplevel"))
+        #: str: Root folder of the snapshot.
+        self.path = None
+        #: list: Staged files (added, copied, modified or renamed) relative
+        #: to :attr:`root`.
+        self.staged = []
+
+    def __enter__(self):
+        """Write the snapshot."""
+        parent = _SHM_DIR if os.access(_SHM_DIR, os.W_OK) else None
+        self.path = os.path.realpath(tempfile.mkdtemp(prefix="yala-",
+                                                      dir=parent))  # fmt: skip
+        try:
+            self._build()
+        except BaseException:
+            shutil.rmtree(self.path, ignore_errors=True)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Remove the snapshot."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def get_targets(self, targets):
+        """Return the snapshot paths of the staged Python files in ``targets``.
+
+        Args:
+            targets (list): Files and folders relative to the current folder.
+
+        Returns:
+            list: Absolute paths in the snapshot.
+
+        """
+        folders = [os.path.realpath(target) for target in targets]
+        paths = (os.path.join(self.root, path) for path in self.staged
+                 if path.endswith(".py"))  # fmt: skip
+        return [self.map_path(path, to_snapshot=True) for path in paths
+                if any(path == folder or path.startswith(folder + os.sep)
+                       for folder in folders)]  # fmt: skip
+
+    def map_path(self, path, to_snapshot=False):
+        """Replace the snapshot folder by the repository one in a path.
+
+        Args:
+            path (str): Path or text with a path, e.g. an error message.
+            to_snapshot (bool): Replace the repository folder instead.
+
+        """
+        if to_snapshot:
+            return path.replace(self.root, self.path, 1)
+        return path.replace(self.path, self.root, 1)
+
+    def get_original_path(self, path):
+        """Return the repository path of a snapshot file, as in normal runs.
+
+        Paths in the repository are relative to the current folder.
+        """
+        mapped = self.map_path(path)
+        if os.path.isabs(mapped) and mapped.startswith(self.root + os.sep):
+            return os.path.relpath(mapped)
+        return mapped
+
+    def _build(self):
+        """Write changed files and link the others."""
+        self.staged = self._git_paths("diff", "--cached", "--name-only",
+                                      "--diff-filter=ACMR")  # fmt: skip
+        unstaged = self._git_paths("diff", "--name-only")
+        copied = set(self.staged).union(unstaged)
+        folders = {parent for path in copied for parent in _parents(path)}
+        for folder in folders:
+            os.makedirs(os.path.join(self.path, folder), exist_ok=True)
+        for path, content in self._read_blobs(sorted(copied)):
+            Path(self.path, path).write_bytes(content)
+        for folder in folders:
+            self._link_others(folder, copied, folders)
+
+    def _link_others(self, folder, copied, folders):
+        """Link entries of a working tree folder that were not written."""
+        real_folder = os.path.join(self.root, folder)
+        if not os.path.isdir(real_folder):
+            return
+        for entry in os.scandir(real_folder):
+            path = posixpath.join(folder, entry.name)
+            if path in copied or path in folders or path == ".git":
+                continue
+            os.symlink(entry.path, os.path.join(self.path, path))
+
+    def _read_blobs(self, paths):
+        """Yield paths and their staged contents, read by one git process."""
+        paths = [path for path in paths if "\n" not in path]
+        request = b"".join(b":" + os.fsencode(path) + b"\n" for path in paths)
+        output = subprocess.run(  # nosec
+            ["git", "cat-file", "--batch"],
+            input=request,
+            stdout=subprocess.PIPE,
+            cwd=self.root,
+            check=True,
+        ).stdout
+        start = 0
+        for path in paths:
+            end = output.index(b"\n", start)
+            # "<oid> <type> <size>" or "<object> missing"
+            header = output[start:end].split()
+            start = end + 1
+            if len(header) == 3:
+                size = int(header[2])
+                if header[1] == b"blob":
+                    yield path, output[start:start + size]
+                start += size + 1
+
+    def _git_paths(self, *args):
+        """Return the paths listed by a git command, relative to the root."""
+        output = self._git(*args, "-z", decode=False)
+        return [os.fsdecode(path) for path in output.split(b"\0") if path]
+
+    @staticmethod
+    def _git(*args, decode=True):
+        """Run git in the current folder and return its stdout."""
+        stdout = subprocess.run(  # nosec
+            ["git", *args], stdout=subprocess.PIPE, check=True
+        ).stdout
+        return stdout.decode().strip() if decode else stdout
+
+
+def _parents(path):
+    """Return the folders of a path relative to the root, including it."""
+    parents = [""]
+    parts = path.split("/")[:-1]
+    for end in range(1, len(parts) + 1):
+        parents.append("/".join(parts[:end]))
+    return parents
@@ -0,0 +1,202 @@
+"""Keep the results of every run in a SQLite database.
+
+A run only stores the results of the files it linted, so incremental runs
+insert few rows. The current results of a file for a linter are the ones of
+the last run that linted it.
+"""
+import logging
+import sqlite3
+import time
+
+from .base import LinterOutput
+from .targets import normalize_path
+
+LOG = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS linted (
+    run_id INTEGER NOT NULL,
+    linter TEXT NOT NULL,
+    path TEXT NOT NULL,
+    digest TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL,
+    linter TEXT NOT NULL,
+    path TEXT NOT NULL,
+    line_nr INTEGER,
+    col INTEGER,
+    rule TEXT,
+    msg TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS linted_idx ON linted (linter, path, run_id);
+CREATE INDEX IF NOT EXISTS results_run_idx ON results (run_id);
+CREATE INDEX IF NOT EXISTS results_path_idx ON results (path, linter, run_id);
+CREATE INDEX IF NOT EXISTS results_rule_idx ON results (rule);
+CREATE VIEW IF NOT EXISTS current AS
+    SELECT results.* FROM results
+    JOIN (SELECT linter, path, MAX(run_id) AS run_id
+          FROM linted GROUP BY linter, path) USING (linter, path, run_id);
+"""
+
+_RESULT_COLUMNS = "linter, path, msg, line_nr, col"
+
+
+class ResultStore:
+    """Store results in and query them from a SQLite database."""
+
+    #: int: Databases with another version are created again.
+    _SCHEMA_VERSION = 2
+
+    def __init__(self, path):
+        """Open (or create) the database.
+
+        Args:
+            path (str): Database file path.
+
+        """
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._create_schema()
+
+    def __enter__(self):
+        """Close the database when leaving the context."""
+        return self
+
+    def __exit__(self, *_exc_info):
+        """Close the database."""
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+    def _create_schema(self):
+        (version,) = self._db.execute("PRAGMA user_version").fetchone()
+        if version != self._SCHEMA_VERSION:
+            if version:
+                LOG.warning("Discarding results of an old yala version.")
+            self._drop_all()
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {self._SCHEMA_VERSION}")
+
+    def _drop_all(self):
+        with self._db:
+            self._db.execute("DROP VIEW IF EXISTS current")
+            for table in ("runs", "linted", "results"):
+                self._db.execute(f"DROP TABLE IF EXISTS {table}")  # nosec
+
+    def add_run(self, linted, results):
+        """Store a run in a single transaction and return its id.
+
+        Args:
+            linted (iterable): ``(linter name, path, digest)`` of each linted
+                file. The digest identifies the linted content.
+            results (iterable of LinterOutput): Results of the linted files.
+                Their paths are stored relative to the current folder, as
+                the linted ones.
+
+        """
+        # Linters may print absolute paths (e.g. black with folders)
+        linted = {(linter, normalize_path(path)): digest
+                  for linter, path, digest in linted}  # fmt: skip
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO runs (created) VALUES (?)", (time.time(),)
+            )
+            run_id = cursor.lastrowid
+            rows = []
+            for result in results:
+                path = normalize_path(result.path)
+                linted.setdefault((result.linter_name, path), None)
+                rows.append(
+                    (run_id, result.linter_name, path, result.line_nr,
+                     result.col, result.rule, result.msg)
+                )  # fmt: skip
+            self._db.executemany(
+                "INSERT INTO linted VALUES (?, ?, ?, ?)",
+                ((run_id, linter, path, digest)
+                 for (linter, path), digest in linted.items()),
+            )  # fmt: skip
+            self._db.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return run_id
+
+    def get_last_run_id(self):
+        """Return the id of the last stored run or ``None``."""
+        return self._db.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+
+    def get_digests(self, linter):
+        """Return the digest of each file when ``linter`` last linted it."""
+        cursor = self._db.execute(
+            "SELECT path, digest FROM linted AS last WHERE linter = :linter "
+            "AND run_id = (SELECT MAX(run_id) FROM linted "
+            "WHERE linter = :linter AND path = last.path)",
+            {"linter": linter},
+        )
+        return dict(cursor)
+
+    def get_current_results(self):
+        """Return the latest results of every linted file."""
+        cursor = self._db.execute(f"SELECT {_RESULT_COLUMNS} FROM current")
+        return self._to_outputs(cursor)
+
+    def get_new_results(self, run_id=None):
+        """Return results of a run that the previous run didn't have.
+
+        For each result, the previous run is the latest one before ``run_id``
+        that linted the same file with the same linter. Results are compared
+        by message only, as line numbers change.
+
+        Args:
+            run_id (int): Defaults to the last run.
+
+        """
+        if run_id is None:
+            run_id = self.get_last_run_id()
+        cursor = self._db.execute(
+            f"""
+            SELECT {_RESULT_COLUMNS} FROM results AS new
+            WHERE run_id = :run_id AND NOT EXISTS (
+                SELECT 1 FROM results AS old
+                WHERE old.linter = new.linter AND old.path = new.path
+                    AND old.msg = new.msg
+                    AND old.run_id = (
+                        SELECT MAX(run_id) FROM linted
+                        WHERE linted.linter = new.linter
+                            AND linted.path = new.path
+                            AND linted.run_id < :run_id
+                    )
+            )
+            """,  # nosec
+            {"run_id": run_id},
+        )
+        return self._to_outputs(cursor)
+
+    def count_by_file(self):
+        """Return ``(path, count)`` of current results, most issues first."""
+        return self._db.execute(
+            "SELECT path, COUNT(*) AS total FROM current "
+            "GROUP BY path ORDER BY total DESC, path"
+        ).fetchall()
+
+    def count_by_rule(self):
+        """Return ``(linter, rule, count)`` of current results.
+
+        Rules are ``None`` for linters without rule codes in their messages.
+        """
+        return self._db.execute(
+            "SELECT linter, rule, COUNT(*) AS total FROM current "
+            "GROUP BY linter, rule ORDER BY total DESC, linter, rule"
+        ).fetchall()
+
+    @staticmethod
+    def _to_outputs(rows):
+        return [LinterOutput(*row) for row in rows]
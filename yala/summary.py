@@ -0,0 +1,62 @@
+"""Issue counts for results too many to be printed one by one."""
+from collections import Counter
+
+#: int: Length of the longest histogram bar.
+_BAR_WIDTH = 40
+
+
+class Summary:
+    """Count issues by linter, rule and file without keeping the results.
+
+    The length of a summary is its number of issues, as for a result list.
+    """
+
+    def __init__(self):
+        """Start with no issues."""
+        self.by_linter = Counter()
+        self.by_rule = Counter()
+        self.by_file = Counter()
+
+    def __len__(self):
+        """Return the number of issues."""
+        return sum(self.by_linter.values())
+
+    def update(self, results):
+        """Count results in a single pass and return this summary.
+
+        Args:
+            results (iterable of LinterOutput): Results, e.g. a generator.
+
+        """
+        for result in results:
+            linter = result.linter_name
+            self.by_linter[linter] += 1
+            self.by_rule[(linter, result.rule)] += 1
+            self.by_file[result.path] += 1
+        return self
+
+    def merge(self, other):
+        """Add the counts of another summary to this one."""
+        self.by_linter.update(other.by_linter)
+        self.by_rule.update(other.by_rule)
+        self.by_file.update(other.by_file)
+
+    def print(self, top=10):
+        """Print histograms of all linters and the ``top`` rules and files."""
+        _print_histogram("Issues by linter", self.by_linter.most_common())
+        rules = [(f"{rule or '-'} [{linter}]", total)
+                 for (linter, rule), total in self.by_rule.most_common(top)]
+        _print_histogram(f"Top {top} rules", rules)
+        _print_histogram(f"Top {top} files", self.by_file.most_common(top))
+
+
+def _print_histogram(title, label_totals):
+    """Print a title and one bar per label, scaled to the largest total."""
+    print(f"{title}:")
+    if not label_totals:
+        return
+    largest = label_totals[0][1]
+    for label, total in label_totals:
+        length = max(1, total * _BAR_WIDTH // largest)
+        print(f"{total:>9} {'#' * length:<{_BAR_WIDTH}} {label}")
+    print()
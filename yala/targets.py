@@ -0,0 +1,162 @@
+"""Expand linter targets (files and folders) into Python files."""
+import logging
+import os
+import re
+from collections import Counter
+from fnmatch import translate
+from pathlib import Path, PurePath
+
+LOG = logging.getLogger(__name__)
+
+#: set: Folders that are never linted
+_SKIPPED_DIRS = {"__pycache__", "node_modules"}
+
+
+def expand_targets(targets, target_filter=None):
+    """Yield the Python files that linters check in the given targets.
+
+    Files are yielded as given. Folders are walked recursively, skipping
+    hidden ones (e.g. ``.git`` and ``.tox``).
+
+    Args:
+        targets (list): Files and folders to lint.
+        target_filter (TargetFilter): Skip the files it doesn't keep.
+
+    """
+    for target in targets:
+        path = Path(target)
+        files = _walk(path) if path.is_dir() else [str(path)]
+        if target_filter:
+            files = filter(target_filter.keep, files)
+        yield from files
+
+
+def _walk(folder):
+    """Yield Python files in ``folder`` in a stable order."""
+    for path in sorted(folder.iterdir()):
+        if path.is_dir():
+            if not _is_skipped(path):
+                yield from _walk(path)
+        elif path.suffix == ".py":
+            yield str(path)
+
+
+def _is_skipped(folder):
+    """Whether a folder should not be linted."""
+    return folder.name.startswith(".") or folder.name in _SKIPPED_DIRS
+
+
+def normalize_path(path):
+    """Return a path relative to the current folder, as in target lists."""
+    if os.path.isabs(path):
+        try:
+            path = os.path.relpath(path)
+        except ValueError:  # another drive on Windows
+            return path
+    return os.path.normpath(path)
+
+
+def compile_globs(globs):
+    """Return a regex matching any of the glob patterns, or ``None``.
+
+    As in :mod:`fnmatch`, ``*`` also matches ``/``.
+    """
+    if not globs:
+        return None
+    return re.compile("|".join(translate(glob) for glob in globs))
+
+
+class TargetFilter:
+    """Skip oversized, generated and vendored files before linting.
+
+    Linters may spend most of their time in generated (e.g. protobuf) and
+    vendored modules, whose issues are not fixed in this tree. Only the
+    first bytes of a file are read to find "generated" comments.
+    """
+
+    #: int: Bytes read from the start of a file to find generated markers.
+    HEADER_SIZE = 4096
+
+    def __init__(self, max_size=None, skip_generated=False, vendored=()):
+        """Set what is skipped. By default, all files are kept.
+
+        Args:
+            max_size (int): Size in bytes of the largest file to keep.
+            skip_generated (bool): Skip files with comments such as
+                "# Code generated ... DO NOT EDIT." or "# @generated" near
+                the start.
+            vendored (list): Glob patterns of paths to skip, e.g.
+                ``["*/vendor/*"]``.
+
+        """
+        self._max_size = max_size
+        self._generated = None
+        if skip_generated:
+            self._generated = re.compile(
+                rb"^[ \t]*#.*(?:@generated\b|\bgenerated\b.*\bdo not edit\b)",
+                re.IGNORECASE | re.MULTILINE,
+            )
+        self._vendored = compile_globs(vendored)
+        #: Counter: Number of skipped files by reason.
+        self.skipped = Counter()
+        #: int: Total size of the skipped files in bytes.
+        self.skipped_bytes = 0
+        #: dict: Whether each checked path is kept, to check it once.
+        self._kept = {}
+
+    @classmethod
+    def from_config(cls, config):
+        """Return the filter set by the yala configuration."""
+        return cls(config.max_file_size, config.skip_generated,
+                   config.vendored)  # fmt: skip
+
+    def __bool__(self):
+        """Whether any file may be skipped."""
+        return bool(self._max_size or self._generated or self._vendored)
+
+    def keep(self, path):
+        """Whether a file should be linted. Counts skipped files."""
+        if path not in self._kept:
+            reason, size = self._get_skip_reason(path)
+            self._kept[path] = reason is None
+            if reason:
+                self.skipped[reason] += 1
+                self.skipped_bytes += size
+        return self._kept[path]
+
+    def _get_skip_reason(self, path):
+        """Return why a file is skipped (``None`` if not) and its size."""
+        if self._vendored and self._vendored.match(PurePath(path).as_posix()):
+            return "vendored", _get_size(path)
+        size = _get_size(path)
+        if self._max_size and size > self._max_size:
+            return "oversized", size
+        if self._generated and self._is_generated(path):
+            return "generated", size
+        return None, size
+
+    def _is_generated(self, path):
+        """Whether the start of a file has a "generated" comment."""
+        try:
+            with open(path, "rb") as file:
+                header = file.read(self.HEADER_SIZE)
+        except OSError:
+            return False
+        return bool(self._generated.search(header))
+
+    def log(self):
+        """Log how many files were skipped and their total size."""
+        if self.skipped:
+            reasons = ", ".join(
+                f"{total} {reason}" for reason, total in self.skipped.items()
+            )
+            LOG.info("Skipped %s file(s), %d KiB", reasons,
+                     self.skipped_bytes // 1024)  # fmt: skip
+
+
+def _get_size(path):
+    """Return the size of a file in bytes, or 0 if it can't be read."""
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return 0